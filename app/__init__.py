@@ -4,11 +4,12 @@ import os
 
 from flask import Flask
 from flask_restx import Api
-from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 
 from dotenv import load_dotenv
 
+from app.database.utils.routing import RoutingSQLAlchemy
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -20,11 +21,13 @@ api = Api(
 env_config = os.getenv("APP_SETTINGS", "app.config.DevelopmentConfig")
 app.config.from_object(env_config)
 
-db = SQLAlchemy(app)
+db = RoutingSQLAlchemy(app)
 migrate = Migrate(app, db)
 
 from app import manage
 from app import logging
+from app import metrics
+from app import queries
 
 from app import auth
 from app import resources
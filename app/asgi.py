@@ -0,0 +1,191 @@
+"""ASGI serving mode of read-only endpoints.
+
+GET and HEAD requests of /films/, /films/<id>, /directors/ and /genres/ are served with async sessions and have the
+same bodies as Flask app responses, they are parsed by the same parsers. Other paths get 404 and other methods 405,
+so a proxy should route only these reads here and everything else to the WSGI app. Conditional GET headers are not
+supported. Films pages are cached under the films change counter, so writes of the WSGI app make them stale.
+Needs async driver of the database, e.g. asyncpg or aiosqlite.
+
+Run from project root: uvicorn asgi:application
+"""
+
+import re
+import traceback
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict, MIMEAccept
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header
+
+from app import app
+
+from app.database.cruds.async_cruds import AsyncFilmsCRUD, AsyncGenresCRUD, AsyncDirectorsCRUD
+from app.database.utils.async_engine import async_session, dispose_async_engines
+from app.schemas.films import FilmsQuerySchema
+from app.domain.films import get_all_films_dicts, get_films_next_cursor, get_one_film
+from app.domain.genres import get_all_genres
+from app.domain.directors import get_all_directors
+from app.utils.exceptions import EntityIdError, CursorError
+
+from app.resources.films import films_cache, films_generation
+from app.resources.parsers.films import films_query_parser
+from app.resources.utils.representations import dumps
+from app.resources.utils.responses import NDJSON_MIMETYPE
+
+READ_METHODS = ("GET", "HEAD")
+
+
+async def films(session, request) -> tuple[Any, int]:
+    query = FilmsQuerySchema.parse_obj(films_query_parser.parse_args(req=request))
+    crud = AsyncFilmsCRUD(session)
+
+    if request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return crud.read_dicts_iter(query), 200
+
+    generation = await session.run_sync(films_generation)
+    response = films_cache.get(query.cache_key(), generation=generation)
+
+    if response is None:
+        try:
+            films_dicts = await get_all_films_dicts(crud, query)
+        except CursorError as err:
+            return {"message": str(err)}, 400
+
+        response = {
+            "count": len(films_dicts),
+            "result": films_dicts,
+            "next_cursor": get_films_next_cursor(crud, films_dicts, query)
+        }
+
+        films_cache.set(query.cache_key(), response, generation=generation)
+
+    return response, 200
+
+
+async def film(session, request, film_id: str) -> tuple[Any, int]:
+    try:
+        return (await get_one_film(AsyncFilmsCRUD(session), int(film_id))).dict(), 200
+    except EntityIdError as err:
+        return {"message": str(err)}, 404
+
+
+async def directors(session, request) -> tuple[Any, int]:
+    directors_schemas = await get_all_directors(AsyncDirectorsCRUD(session))
+
+    return {"count": len(directors_schemas), "result": [director.dict() for director in directors_schemas]}, 200
+
+
+async def genres(session, request) -> tuple[Any, int]:
+    genres_schemas = await get_all_genres(AsyncGenresCRUD(session))
+
+    return {"count": len(genres_schemas), "result": [genre.dict() for genre in genres_schemas]}, 200
+
+
+ROUTES: list[tuple[re.Pattern, Callable]] = [
+    (re.compile(r"/films/"), films),
+    (re.compile(r"/films/(?P<film_id>\d+)"), film),
+    (re.compile(r"/directors/"), directors),
+    (re.compile(r"/genres/"), genres)
+]
+
+
+def _route(path: str):
+    for pattern, handler in ROUTES:
+        match = pattern.fullmatch(path)
+
+        if match:
+            return handler, match.groupdict()
+
+    return None, {}
+
+
+def _request(scope) -> SimpleNamespace:
+    """Returns request with attributes used by parsers and handlers."""
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+
+    return SimpleNamespace(
+        method=scope["method"],
+        args=MultiDict(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)),
+        accept_mimetypes=parse_accept_header(headers.get("accept"), MIMEAccept)
+    )
+
+
+async def _send_json(send, request, data, status: int):
+    """Sends JSON response encoded like Flask app ones."""
+    body = dumps(data, indent=app.debug) + b"\n"
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": b"" if request.method == "HEAD" else body})
+
+
+async def _send_ndjson(send, request, items: AsyncIterator[dict[str, Any]]):
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", NDJSON_MIMETYPE.encode())]
+    })
+
+    if request.method != "HEAD":
+        async for item in items:
+            await send({"type": "http.response.body", "body": dumps(item) + b"\n", "more_body": True})
+
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await dispose_async_engines()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _respond(send, request, path: str):
+    handler, params = _route(path)
+
+    if handler is None:
+        return await _send_json(send, request, {"message": "Not found."}, 404)
+
+    if request.method not in READ_METHODS:
+        return await _send_json(send, request, {"message": "Method not allowed."}, 405)
+
+    async with async_session() as session:
+        try:
+            data, status = await handler(session, request, **params)
+
+            if isinstance(data, AsyncIterator):
+                return await _send_ndjson(send, request, data)
+
+        except HTTPException as err:
+            data, status = getattr(err, "data", None) or {"message": err.description}, err.code
+
+        except Exception:
+            app.logger.critical("There is a critical error. Look traceback below.")
+            app.logger.critical(traceback.format_exc())
+
+            data, status = {"message": "Internal server error."}, 500
+
+        return await _send_json(send, request, data, status)
+
+
+async def application(scope, receive, send):
+    """ASGI application serving read-only endpoints."""
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+
+    if scope["type"] != "http":
+        return None
+
+    # Parsers and JSON encoding read app config.
+    with app.app_context():
+        return await _respond(send, _request(scope), scope["path"])
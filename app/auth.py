@@ -1,15 +1,17 @@
 """Module implements auth functionality."""
 
 from flask import request
-from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from flask_restx import Resource, fields, Namespace
-
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, object_session, Session
 
 from app import app, api, db
 
 from app.database.models import User, Role
 from app.schemas.users import UserWithRoleSchema
+from app.utils.cache import LRUCache
+from app.utils.passwords import hash_password, check_password, password_needs_rehash
 from app.resources.models.auth import login_response, register_response, logout_response
 from app.resources.models.users import user_info
 
@@ -24,10 +26,64 @@ auth_model = api.model("Auth Model", {
 })
 
 
+# Identities are invalidated after commits of this process, other processes see changes after USERS_CACHE_TTL.
+users_identities = LRUCache(app.config["USERS_CACHE_SIZE"], app.config["USERS_CACHE_TTL"], name="users")
+
+
+class UserIdentity(UserMixin, UserWithRoleSchema):
+    """Logged in user data, which is cached between requests and used as current_user."""
+
+    def is_admin(self):
+        return self.role.name == "admin"
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    """Returns User object by user_id."""
-    return User.query.get(user_id)
+    """Returns identity of user by user_id, loading user with joined role on cache miss."""
+    user_id = int(user_id)
+    identity = users_identities.get(user_id)
+
+    if identity is None:
+        user = db.session.get(User, user_id, options=[joinedload(User.role)])
+
+        if not user:
+            return None
+
+        identity = UserIdentity.from_orm(user)
+        users_identities.set(user_id, identity)
+
+    return identity
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def collect_changed_user(mapper, connection, user):
+    """Remembers changed user, its identity is invalidated when the change is committed."""
+    object_session(user).info.setdefault("changed_users_ids", set()).add(user.id)
+
+
+@event.listens_for(Role, "after_update")
+@event.listens_for(Role, "after_delete")
+def collect_changed_role(mapper, connection, role):
+    """Remembers role change, users identities hold roles, so all of them are invalidated on commit."""
+    object_session(role).info["roles_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_users_identities(session):
+    """Removes identities of users changed by committed transaction from users identities cache."""
+    if session.info.pop("roles_changed", False):
+        users_identities.clear()
+
+    for user_id in session.info.pop("changed_users_ids", ()):
+        users_identities.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_users_changes(session):
+    """Forgets users and roles changes of rolled back transaction."""
+    session.info.pop("roles_changed", None)
+    session.info.pop("changed_users_ids", None)
 
 
 @login_manager.unauthorized_handler
@@ -65,7 +121,7 @@ class RegisterRoute(Resource):
         if User.query.filter_by(username=username).first():
             return {"message": "Username is already used."}, 400
 
-        password_hash = generate_password_hash(password)
+        password_hash = hash_password(password)
 
         user_role = Role.query.filter_by(name="user").first()
 
@@ -94,7 +150,11 @@ class LoginRoute(Resource):
 
         user = User.query.filter_by(username=username).first()
 
-        if user and check_password_hash(user.password, password):
+        if user and check_password(user.password, password):
+            if password_needs_rehash(user.password):
+                user.password = hash_password(password)
+                db.session.commit()
+
             login_user(user)
             app.logger.info("%s logged in successfully.", user.username)
 
@@ -3,9 +3,31 @@
 import os
 from dotenv import load_dotenv
 
+from app.database.utils.routing import replicas_binds
+
 
 load_dotenv()
 
+# Engine options by environment variables, options of unset variables keep SQLAlchemy defaults.
+ENGINE_OPTIONS_ENV = {
+    "DB_POOL_SIZE": ("pool_size", int),
+    "DB_MAX_OVERFLOW": ("max_overflow", int),
+    "DB_POOL_TIMEOUT": ("pool_timeout", float),
+    "DB_POOL_RECYCLE": ("pool_recycle", int),
+    "DB_POOL_PRE_PING": ("pool_pre_ping", lambda value: bool(int(value)))
+}
+
+
+def engine_options_from_env() -> dict:
+    """Returns SQLAlchemy engine options set in environment."""
+    options = {}
+
+    for variable, (option, type_) in ENGINE_OPTIONS_ENV.items():
+        if os.getenv(variable):
+            options[option] = type_(os.getenv(variable))
+
+    return options
+
 
 class Config:
     ENV = "production"
@@ -13,10 +35,26 @@ class Config:
     DEVELOPMENT = False
     SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI")
+    SQLALCHEMY_ASYNC_DATABASE_URI = os.getenv("SQLALCHEMY_ASYNC_DATABASE_URI")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options_from_env()
+    SQLALCHEMY_BINDS = replicas_binds(os.getenv("SQLALCHEMY_REPLICAS_URIS"))
+    DB_PRIMARY_STICKY_SECONDS = float(os.getenv("DB_PRIMARY_STICKY_SECONDS", 5))
     ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
-    RESTFUL_JSON = {"ensure_ascii": False}
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    RESTX_JSON = {"ensure_ascii": False}
     FILMS_PER_PAGE = int(os.getenv("FILMS_PER_PAGE", 10))
+    FILMS_STREAM_CHUNK_SIZE = int(os.getenv("FILMS_STREAM_CHUNK_SIZE", 1000))
+    FILMS_CACHE_SIZE = int(os.getenv("FILMS_CACHE_SIZE", 256))
+    FILMS_CACHE_TTL = float(os.getenv("FILMS_CACHE_TTL", 60))
+    USERS_CACHE_SIZE = int(os.getenv("USERS_CACHE_SIZE", 1024))
+    USERS_CACHE_TTL = float(os.getenv("USERS_CACHE_TTL", 60))
+    FILMS_BULK_CHUNK_SIZE = int(os.getenv("FILMS_BULK_CHUNK_SIZE", 1000))
+    FILMS_INDEX_ENABLED = bool(int(os.getenv("FILMS_INDEX_ENABLED", 0)))
+    METRICS_ENABLED = bool(int(os.getenv("METRICS_ENABLED", 1)))
+    SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD", 0.5))
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,121 @@
+"""Module implements CRUD classes reading with async sessions, used by ASGI serving mode.
+
+They build the same queries as sync CRUD classes, from select() statements instead of session queries.
+"""
+
+from typing import Any, AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import app
+
+from app.utils.exceptions import EntityIdError
+from app.database.models import Film, Genre, Director
+from app.database.cruds.base import BaseCRUD
+from app.database.cruds.films import FilmsCRUD
+from app.database.utils.orm import films_cursor_filter, FILMS_DEFAULT_LOADING
+from app.database.utils.serializers import films_row_serializer, genre_row_to_dict
+from app.schemas.films import FilmsQuerySchema, FilmSchema
+from app.schemas.genres import GenreSchema
+from app.schemas.directors import DirectorSchema
+
+
+class AsyncCRUD(BaseCRUD):
+    """Async CRUD class reading entities ordered by id."""
+
+    async def read(self) -> list:
+        """Returns entities."""
+        objs = await self.db.scalars(select(self.model).order_by(self.model.id.asc()))
+
+        return [self.schema.from_orm(obj) for obj in objs]
+
+    async def read_one(self, id_: int):
+        """Returns a specific entity."""
+        obj = await self.db.scalar(select(self.model).where(self.model.id == id_))
+
+        if not obj:
+            raise EntityIdError("{} with such id not found: {}.".format(self.model.__name__, id_))
+
+        return self.schema.from_orm(obj)
+
+
+class AsyncGenresCRUD(AsyncCRUD):
+    """Async Genres CRUD class."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(Genre, GenreSchema, session)
+
+
+class AsyncDirectorsCRUD(AsyncCRUD):
+    """Async Directors CRUD class."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(Director, DirectorSchema, session)
+
+
+class AsyncFilmsCRUD(FilmsCRUD):
+    """Async Films CRUD class, only its reading methods are async and can be used.
+
+    Relationships are loaded with FILMS_DEFAULT_LOADING strategies, lazy loading is not possible with async session.
+    Films index is not used, its updates rely on sync session.
+    """
+
+    def __init__(self, session: AsyncSession):
+        BaseCRUD.__init__(self, Film, FilmSchema, session)
+
+        self.loading = FILMS_DEFAULT_LOADING
+
+    def _select(self, *entities):
+        return select(*entities)
+
+    async def _films_page(self, films_query, data: FilmsQuerySchema) -> list:
+        """Returns films rows of page or following cursor from query parameters, all films if page is -1."""
+        films_per_page = app.config["FILMS_PER_PAGE"]
+
+        if data.cursor:
+            last_value, last_id = self._decode_cursor(data.cursor, data.sort_by)
+            films_query = films_cursor_filter(films_query, data.sort_by, data.sort_order, last_value, last_id) \
+                .limit(films_per_page)
+        elif data.page != -1:
+            films_query = films_query.limit(films_per_page).offset(((data.page or 1) - 1) * films_per_page)
+
+        return (await self.db.execute(films_query)).all()
+
+    async def _films_genres(self, films_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        films_genres = {}
+
+        for genres_query in self._films_genres_queries(films_ids):
+            for film_id, *genre in await self.db.execute(genres_query):
+                films_genres.setdefault(film_id, []).append(genre_row_to_dict(genre))
+
+        return films_genres
+
+    async def _serialize_rows(self, rows: list, data: FilmsQuerySchema) -> list[dict[str, Any]]:
+        serializer = films_row_serializer(data.fields_names())
+        genres = await self._films_genres([serializer.film_id(row) for row in rows]) if serializer.with_genres \
+            else None
+
+        return [serializer(row, genres) for row in rows]
+
+    async def read_dicts(self, data: FilmsQuerySchema) -> list[dict[str, Any]]:
+        """Returns films according to query parameters as dicts equal to FilmsCRUD.read_dicts() ones."""
+        return await self._serialize_rows(await self._films_page(self._films_rows_query(data), data), data)
+
+    async def read_dicts_iter(self, data: FilmsQuerySchema) -> AsyncIterator[dict[str, Any]]:
+        """Yields all films according to query parameters as dicts, fetching them in chunks."""
+        chunk_size = app.config["FILMS_STREAM_CHUNK_SIZE"]
+        rows = await self.db.stream(self._films_rows_query(data))
+
+        async for chunk in rows.partitions(chunk_size):
+            for film in await self._serialize_rows(chunk, data):
+                yield film
+
+    async def read_one(self, id_: int) -> FilmSchema:
+        """Returns a specific film."""
+        film = await self.db.scalar(self._query().where(Film.id == id_))
+
+        if not film:
+            raise EntityIdError("Film with such id not found: {}.".format(id_))
+
+        return FilmSchema.from_orm(film)
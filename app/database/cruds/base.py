@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session, declarative_base
 from pydantic import BaseModel
 
 from app.utils.exceptions import EntityIdError
+from app.database.utils.versions import bump_table_versions
 
 Base = declarative_base()
 
@@ -37,7 +38,12 @@ class AbstractCRUD(ABC):
 
 
 class BaseCRUD(AbstractCRUD, Generic[ModelType, CreateSchemaType, UpdateSchemaType, ReturnSchemaType]):
-    """Base CRUD class."""
+    """Base CRUD class.
+
+    Writes bump change counters of the model table and of dependent_tables, which embed its entities data.
+    """
+
+    dependent_tables: tuple[str, ...] = ()
 
     def __init__(self, model: Type[ModelType], schema: Type[ReturnSchemaType], db: Session):
         self.model = model
@@ -49,14 +55,23 @@ class BaseCRUD(AbstractCRUD, Generic[ModelType, CreateSchemaType, UpdateSchemaTy
         obj = self.model(**(data.dict()))
 
         self.db.add(obj)
-        self.db.commit()
+        self._commit()
         self.db.refresh(obj)
 
         return self.schema.from_orm(obj)
 
+    def _commit(self):
+        """Commits changes with bumped change counters of changed tables, which marks cached responses as stale."""
+        bump_table_versions(self.db, (self.model.__tablename__,) + self.dependent_tables)
+        self.db.commit()
+
+    def _query(self):
+        """Returns base query for reading entities."""
+        return self.db.query(self.model)
+
     def read(self, *args, **kwargs) -> list[ReturnSchemaType]:
         """Returns entities."""
-        query = self.db.query(self.model)
+        query = self._query()
 
         page = kwargs.get("page", None)
         page_limit = kwargs.get("page_limit", 10)
@@ -76,7 +91,7 @@ class BaseCRUD(AbstractCRUD, Generic[ModelType, CreateSchemaType, UpdateSchemaTy
 
     def read_one(self, id_: int) -> ReturnSchemaType:
         """Returns a specific entity."""
-        obj = self.db.query(self.model).filter(self.model.id == id_).first()
+        obj = self._query().filter(self.model.id == id_).first()
 
         if not obj:
             raise EntityIdError("{} with such id not found: {}.".format(self.model.__name__, id_))
@@ -94,7 +109,7 @@ class BaseCRUD(AbstractCRUD, Generic[ModelType, CreateSchemaType, UpdateSchemaTy
             setattr(obj, key, value) if value else None
 
         self.db.add(obj)
-        self.db.commit()
+        self._commit()
         self.db.refresh(obj)
 
         return self.schema.from_orm(obj)
@@ -107,4 +122,4 @@ class BaseCRUD(AbstractCRUD, Generic[ModelType, CreateSchemaType, UpdateSchemaTy
             raise EntityIdError("{} with such id not found: {}.".format(self.model.__name__, id_))
 
         self.db.delete(obj)
-        self.db.commit()
+        self._commit()
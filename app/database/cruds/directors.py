@@ -10,5 +10,7 @@ from app.schemas.directors import DirectorCreateSchema, DirectorUpdateSchema, Di
 class DirectorsCRUD(BaseCRUD[Director, DirectorCreateSchema, DirectorUpdateSchema, DirectorSchema]):
     """Directors CRUD class."""
 
+    dependent_tables = ("films",)
+
     def __init__(self):
         super().__init__(Director, DirectorSchema, db.session)
@@ -1,29 +1,74 @@
 """Module implements Films CRUD class."""
 
 from datetime import datetime
-from typing import Any
+from itertools import islice
+from typing import Any, Optional, Iterator, Union
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 
 from app import app, db
 
-from app.utils.exceptions import EntityIdError, GenreIdError, DirectorIdError
-from app.database.models import Film, Genre, Director
+from app.utils.exceptions import EntityIdError, GenreIdError, DirectorIdError, CursorError
+from app.utils.helpers import encode_cursor, decode_cursor
+from app.database.models import Film, Genre, Director, User, film_genres
 from app.database.cruds.base import BaseCRUD
-from app.schemas.films import FilmsQuerySchema, FilmBodySchema, FilmWithUserIdBodySchema, FilmSchema
+from app.schemas.films import FilmsQuerySchema, FilmBodySchema, FilmWithUserIdBodySchema, FilmSchema, \
+    film_fields_schema
 
 from app.database.utils.orm import films_search_filter, \
+    films_search_ranking, \
     films_director_filter, \
     films_premiere_date_filter, \
     films_genres_ids_filter, \
     films_ordering_sorting, \
-    films_rating_filter
+    films_rating_filter, \
+    films_relationships_loading, \
+    films_cursor_filter, \
+    films_fields_loading, \
+    films_facets_query, \
+    FILMS_FACETS, \
+    SQL_INTEGERS_RANGE, \
+    FILMS_DEFAULT_LOADING
+from app.database.utils.films_index import films_index
+from app.database.utils.serializers import films_row_serializer, genre_row_to_dict, GENRES_COLUMNS
+
+GENRES_IN_CHUNK_SIZE = 500
 
 
 class FilmsCRUD(BaseCRUD[Film, Any, Any, FilmSchema]):
-    """Films CRUD class."""
+    """Films CRUD class.
+
+    Relationships are loaded by strategies from FILMS_DEFAULT_LOADING,
+    which can be overridden per relationship with loading argument, e.g.
+    FilmsCRUD(loading={"genres": "joined"}).
+    """
 
-    def __init__(self):
+    def __init__(self, loading: Optional[dict[str, str]] = None):
         super().__init__(Film, FilmSchema, db.session)
 
+        self.loading = FILMS_DEFAULT_LOADING | (loading or {})
+
+    def _select(self, *entities):
+        """Returns query of entities, all films queries are built on it."""
+        return self.db.query(*entities)
+
+    def _query(self, fields: Optional[tuple[str, ...]] = None):
+        """Returns films query with relationships loading strategies.
+
+        If fields are passed only these columns and relationships are loaded.
+        """
+        if fields:
+            return films_fields_loading(self._select(Film), self.loading, fields)
+
+        return films_relationships_loading(self._select(Film), self.loading)
+
+    @staticmethod
+    def _schema(data: FilmsQuerySchema):
+        """Returns schema with fields requested in query parameters."""
+        fields = data.fields_names()
+        return film_fields_schema(fields) if fields else FilmSchema
+
     def create(self, data: FilmWithUserIdBodySchema) -> FilmSchema:
         """Creates film and returns it."""
         try:
@@ -44,53 +89,290 @@ class FilmsCRUD(BaseCRUD[Film, Any, Any, FilmSchema]):
             )
 
             if data.genres_ids:
-                for genre_id in set(data.genres_ids):
-                    genre = Genre.query.filter_by(id=genre_id).first()
+                film.genres = self._genres(data.genres_ids)
 
-                    if not genre:
-                        raise GenreIdError("genre with such id not found: {}".format(genre_id))
+            db.session.add(film)
+            self._commit()
 
-                    film.genres.append(genre)
+            film_schema = FilmSchema.from_orm(film)
 
-            db.session.add(film)
-            db.session.commit()
+            if films_index:
+                films_index.upsert(self.db, film)
 
-            return FilmSchema.from_orm(film)
+            return film_schema
 
         except Exception as ex:
             db.session.rollback()
             raise ex
 
+    def bulk_create(self, films: list[FilmWithUserIdBodySchema]) -> list[Union[int, EntityIdError]]:
+        """Creates films and returns for each of them its id or error.
+
+        Directors and genres of all films are checked with one query each, valid films and their genres are inserted
+        in chunks of FILMS_BULK_CHUNK_SIZE, each chunk is committed separately.
+        """
+        directors_ids = {film.director_id for film in films if film.director_id}
+        genres_ids = {genre_id for film in films for genre_id in film.genres_ids or []}
+
+        existing_directors_ids = set(self.db.scalars(select(Director.id).where(Director.id.in_(directors_ids)))) \
+            if directors_ids else set()
+        existing_genres_ids = set(self.db.scalars(select(Genre.id).where(Genre.id.in_(genres_ids)))) \
+            if genres_ids else set()
+
+        results = [None] * len(films)
+        valid_films = []
+
+        for index, film in enumerate(films):
+            missing_genres_ids = sorted(set(film.genres_ids or []) - existing_genres_ids)
+
+            if film.director_id and film.director_id not in existing_directors_ids:
+                results[index] = DirectorIdError("director with such id not found: {}".format(film.director_id))
+            elif missing_genres_ids:
+                results[index] = GenreIdError("genres with such ids not found: {}".format(
+                    ", ".join(map(str, missing_genres_ids))
+                ))
+            else:
+                valid_films.append((index, film))
+
+        chunk_size = app.config["FILMS_BULK_CHUNK_SIZE"]
+
+        for chunk_start in range(0, len(valid_films), chunk_size):
+            chunk = valid_films[chunk_start:chunk_start + chunk_size]
+
+            try:
+                films_ids = self._insert_films([film for _, film in chunk])
+
+                for (index, _), film_id in zip(chunk, films_ids):
+                    results[index] = film_id
+
+            except SQLAlchemyError as err:
+                self.db.rollback()
+
+                for index, _ in chunk:
+                    results[index] = EntityIdError("film has not been created: {}".format(err.__class__.__name__))
+
+        return results
+
+    def _insert_films(self, films: list[FilmWithUserIdBodySchema]) -> list[int]:
+        """Inserts films with genres, commits and returns their ids."""
+        films_objs = [
+            Film(
+                title=film.title,
+                premiere_date=datetime.strptime(film.premiere_date, "%Y-%m-%d") if film.premiere_date else None,
+                director_id=film.director_id,
+                description=film.description,
+                rating=film.rating,
+                poster_url=film.poster_url,
+                user_id=film.user_id
+            )
+            for film in films
+        ]
+
+        self.db.add_all(films_objs)
+        self.db.flush()
+
+        films_ids = [film_obj.id for film_obj in films_objs]
+        films_genres = [
+            {"film_id": film_id, "genre_id": genre_id}
+            for film_id, film in zip(films_ids, films) for genre_id in set(film.genres_ids or [])
+        ]
+
+        if films_genres:
+            self.db.execute(film_genres.insert(), films_genres)
+
+        self._commit()
+
+        for film_obj in films_objs:
+            self.db.expunge(film_obj)
+
+        return films_ids
+
+    def _genres(self, genres_ids: list[int]) -> list[Genre]:
+        """Returns genres with ids, raises GenreIdError with all ids of genres that are not found."""
+        genres = self.db.query(Genre).filter(Genre.id.in_(set(genres_ids))).order_by(Genre.id).all()
+        missing_genres_ids = sorted(set(genres_ids) - {genre.id for genre in genres})
+
+        if missing_genres_ids:
+            raise GenreIdError("genres with such ids not found: {}".format(", ".join(map(str, missing_genres_ids))))
+
+        return genres
+
+    @staticmethod
+    def _films_filter(films_query, data: FilmsQuerySchema):
+        """Returns films query filtered according to query parameters."""
+        films_query = films_search_filter(films_query, data.search, data.search_in_description)
+        films_query = films_director_filter(films_query, data.director_id)
+        films_query = films_rating_filter(films_query, data.rating)
+        films_query = films_premiere_date_filter(films_query, data.start_premiere_date, data.end_premiere_date)
+        films_query = films_genres_ids_filter(films_query, data.genres_ids)
+
+        return films_query
+
+    def _films_query(self, data: FilmsQuerySchema, films_query=None):
+        """Returns films query filtered and sorted according to query parameters.
+
+        Filters are applied to films_query if passed, e.g. to query of films columns.
+        """
+        if films_query is None:
+            films_query = self._query(data.fields_names())
+
+        films_query = self._films_filter(films_query, data)
+
+        if data.sort_by == "relevance":
+            films_query = films_search_ranking(films_query, data.search, data.search_in_description)
+
+        films_query = films_ordering_sorting(films_query, data.sort_by, data.sort_order)
+
+        return films_query
+
+    def _films_page(self, films_query, data: FilmsQuerySchema) -> list:
+        """Returns films of page or following cursor from query parameters, all films if page is -1.
+
+        If films index is enabled, it selects ids of page films and only these films are fetched.
+        """
+        films_per_page = app.config["FILMS_PER_PAGE"]
+        cursor_position = self._decode_cursor(data.cursor, data.sort_by) if data.cursor else None
+
+        films_ids = films_index.select_ids(self.db, data, films_per_page, cursor_position) if films_index else None
+
+        if films_ids is not None:
+            return films_query.filter(Film.id.in_(films_ids)).all()
+
+        if cursor_position:
+            last_value, last_id = cursor_position
+            films_query = films_cursor_filter(films_query, data.sort_by, data.sort_order, last_value, last_id)
+            return films_query.limit(films_per_page).all()
+
+        if data.page == -1:
+            return films_query.all()
+
+        return films_query.paginate(data.page, films_per_page, False).items
+
+    def _films_rows_query(self, data: FilmsQuerySchema):
+        """Returns query of films rows with columns of films_row_serializer(data.fields_names())."""
+        serializer = films_row_serializer(data.fields_names())
+
+        films_query = self._select(*serializer.columns).select_from(Film)
+
+        if serializer.with_director:
+            films_query = films_query.outerjoin(Director, Film.director_id == Director.id)
+
+        if serializer.with_user:
+            films_query = films_query.join(User, Film.user_id == User.id)
+
+        return self._films_query(data, films_query)
+
+    def _films_genres_queries(self, films_ids: list[int]) -> Iterator:
+        """Yields queries of (film_id, *GENRES_COLUMNS) rows of films, one per GENRES_IN_CHUNK_SIZE films."""
+        for chunk_start in range(0, len(films_ids), GENRES_IN_CHUNK_SIZE):
+            yield self._select(film_genres.c.film_id, *GENRES_COLUMNS) \
+                .join(Genre, film_genres.c.genre_id == Genre.id) \
+                .filter(film_genres.c.film_id.in_(films_ids[chunk_start:chunk_start + GENRES_IN_CHUNK_SIZE])) \
+                .order_by(Genre.id)
+
+    def _films_genres(self, films_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        """Returns genres dicts of films mapped by film id."""
+        films_genres = {}
+
+        for genres_query in self._films_genres_queries(films_ids):
+            for film_id, *genre in genres_query:
+                films_genres.setdefault(film_id, []).append(genre_row_to_dict(genre))
+
+        return films_genres
+
+    def _serialize_rows(self, rows: list, data: FilmsQuerySchema) -> list[dict[str, Any]]:
+        """Returns films rows as dicts."""
+        serializer = films_row_serializer(data.fields_names())
+        genres = self._films_genres([serializer.film_id(row) for row in rows]) if serializer.with_genres else None
+
+        return [serializer(row, genres) for row in rows]
+
     def read(self, data: FilmsQuerySchema) -> list[FilmSchema]:
         """Returns films according to query parameters."""
-        search = data.search
-        sort_order = data.sort_order
-        sort_by = data.sort_by
-        director_id = data.director_id
-        rating = data.rating
-        start_premiere_date = data.start_premiere_date
-        end_premiere_date = data.end_premiere_date
-        genres_ids = data.genres_ids
-        page = data.page
+        films = self._films_page(self._films_query(data), data)
+        schema = self._schema(data)
 
-        films_per_page = app.config["FILMS_PER_PAGE"]
+        return [schema.from_orm(film) for film in films]
+
+    def read_dicts(self, data: FilmsQuerySchema) -> list[dict[str, Any]]:
+        """Returns films according to query parameters as dicts equal to read() films dicts.
+
+        Films are selected as rows and serialized without pydantic, so it is used for responses.
+        """
+        return self._serialize_rows(self._films_page(self._films_rows_query(data), data), data)
+
+    def read_dicts_iter(self, data: FilmsQuerySchema) -> Iterator[dict[str, Any]]:
+        """Yields all films according to query parameters as dicts, fetching them in chunks."""
+        chunk_size = app.config["FILMS_STREAM_CHUNK_SIZE"]
+
+        films_query = self._films_rows_query(data)
+        rows = iter(films_query.execution_options(stream_results=True).yield_per(chunk_size))
+
+        while chunk := list(islice(rows, chunk_size)):
+            yield from self._serialize_rows(chunk, data)
+
+    def facets(self, data: FilmsQuerySchema) -> dict[str, list[dict[str, Any]]]:
+        """Returns counts of films matching query parameters per genre, director, rating and premiere year.
+
+        Counts are grouped by one UNION ALL query over filtered films.
+        """
+        facets_query = films_facets_query(self._films_filter(self.db.query(Film.id), data))
+
+        facets = {facet: [] for facet in FILMS_FACETS}
 
-        films_query = Film.query
+        for facet, value, count in self.db.execute(facets_query):
+            facets[facet].append({FILMS_FACETS[facet]: value, "count": count})
 
-        films_query = films_search_filter(films_query, search)
-        films_query = films_director_filter(films_query, director_id)
-        films_query = films_rating_filter(films_query, rating)
-        films_query = films_premiere_date_filter(films_query, start_premiere_date, end_premiere_date)
-        films_query = films_genres_ids_filter(films_query, genres_ids)
-        films_query = films_ordering_sorting(films_query, sort_by, sort_order)
+        return facets
 
-        if page == -1:
-            films = films_query.all()
-        else:
-            films_query = films_query.paginate(page, films_per_page, False)
-            films = films_query.items
+    def next_cursor(self, films: list[dict[str, Any]], data: FilmsQuerySchema) -> Optional[str]:
+        """Returns cursor of the page following films read by data, None if there are no more films."""
+        if (data.page == -1 and not data.cursor) or len(films) < app.config["FILMS_PER_PAGE"]:
+            return None
 
-        return [FilmSchema.from_orm(film) for film in films]
+        if data.sort_by == "relevance":
+            return None
+
+        sort_name = data.sort_by.value if data.sort_by else "id"
+        last_film = films[-1]
+
+        return encode_cursor([sort_name, last_film[sort_name], last_film["id"]])
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_by) -> tuple[Any, int]:
+        """Returns last sort value and last id from cursor made by next_cursor."""
+        sort_name = sort_by.value if sort_by else "id"
+
+        try:
+            cursor_sort_name, last_value, last_id = decode_cursor(cursor)
+
+            if cursor_sort_name != sort_name or sort_name == "relevance":
+                raise ValueError()
+
+            if sort_name == "premiere_date":
+                last_value = datetime.strptime(last_value, "%Y-%m-%d").date()
+            else:
+                last_value = int(last_value)
+
+            last_id = int(last_id)
+
+            if last_id not in SQL_INTEGERS_RANGE or (sort_name != "premiere_date"
+                                                      and last_value not in SQL_INTEGERS_RANGE):
+                raise ValueError()
+
+            return last_value, last_id
+
+        except (TypeError, ValueError, OverflowError):
+            raise CursorError("cursor doesn't match sort parameters: {}".format(cursor))
+
+    def read_user_id(self, id_: int) -> int:
+        """Returns id of user who created film, reading only this column."""
+        user_id = self.db.scalar(select(Film.user_id).where(Film.id == id_))
+
+        if user_id is None:
+            raise EntityIdError("Film with such id not found: {}.".format(id_))
+
+        return user_id
 
     def update(self, id_: int, data: FilmBodySchema) -> FilmSchema:
         """Updates film and returns it."""
@@ -114,21 +396,26 @@ class FilmsCRUD(BaseCRUD[Film, Any, Any, FilmSchema]):
             film.poster_url = data.poster_url
 
             if data.genres_ids:
-                del film.genres[:]
-
-                for genre_id in set(data.genres_ids):
-                    genre = Genre.query.filter_by(id=genre_id).first()
+                # collection replacement is diffed, only film_genres rows of changed genres are deleted or inserted
+                film.genres = self._genres(data.genres_ids)
 
-                    if not genre:
-                        raise GenreIdError("genre with such ID not found: {}.".format(genre_id))
+            db.session.add(film)
+            self._commit()
 
-                    film.genres.append(genre)
+            film_schema = FilmSchema.from_orm(film)
 
-            db.session.add(film)
-            db.session.commit()
+            if films_index:
+                films_index.upsert(self.db, film)
 
-            return FilmSchema.from_orm(film)
+            return film_schema
 
         except Exception as err:
             db.session.rollback()
             raise err
+
+    def delete(self, id_: int) -> None:
+        """Deletes film."""
+        super().delete(id_)
+
+        if films_index:
+            films_index.remove(self.db, id_)
@@ -12,6 +12,8 @@ from app.utils.exceptions import GenreAlreadyExistsError, EntityIdError
 class GenresCRUD(BaseCRUD[Genre, GenreCreateSchema, GenreUpdateSchema, GenreSchema]):
     """Genres CRUD class."""
 
+    dependent_tables = ("films",)
+
     def __init__(self):
         super().__init__(Genre, GenreSchema, db.session)
 
@@ -23,7 +25,7 @@ class GenresCRUD(BaseCRUD[Genre, GenreCreateSchema, GenreUpdateSchema, GenreSche
         genre = Genre(name=data.name)
 
         db.session.add(genre)
-        db.session.commit()
+        self._commit()
 
         return GenreSchema.from_orm(genre)
 
@@ -40,6 +42,6 @@ class GenresCRUD(BaseCRUD[Genre, GenreCreateSchema, GenreUpdateSchema, GenreSche
         genre.name = data.name
 
         db.session.add(genre)
-        db.session.commit()
+        self._commit()
 
         return GenreSchema.from_orm(genre)
@@ -1,10 +1,22 @@
 """Module with database models."""
 
 from flask_login import UserMixin
+from sqlalchemy import event, DDL
 
 from app import db
 
 
+class ChangeCounter(db.Model):
+    __tablename__ = "change_counters"
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ChangeCounter table_name={self.table_name}, version={self.version}>"
+
+
 class Role(db.Model):
     __tablename__ = "roles"
 
@@ -25,12 +37,7 @@ class User(db.Model, UserMixin):
     role = db.relationship("Role")
 
     def is_admin(self):
-        role = Role.query.filter_by(id=self.role_id).first()
-
-        if not role or role.name != "admin":
-            return False
-
-        return True
+        return self.role is not None and self.role.name == "admin"
 
     def __repr__(self):
         return f"<User username={self.username}, role_id={self.role_id}>"
@@ -50,7 +57,8 @@ class Director(db.Model):
 film_genres = db.Table("film_genres",
                        db.Column("film_id", db.Integer, db.ForeignKey("films.id", ondelete="CASCADE")),
                        db.Column("genre_id", db.Integer, db.ForeignKey("genres.id", ondelete="CASCADE")),
-                       db.UniqueConstraint("film_id", "genre_id")
+                       db.UniqueConstraint("film_id", "genre_id"),
+                       db.Index("ix_film_genres_genre_id_film_id", "genre_id", "film_id")
                        )
 
 
@@ -66,6 +74,14 @@ class Genre(db.Model):
 
 class Film(db.Model):
     __tablename__ = "films"
+    __table_args__ = (
+        db.Index("ix_films_rating_id", "rating", "id"),
+        db.Index("ix_films_rating_premiere_date_id", "rating", "premiere_date", "id"),
+        db.Index("ix_films_premiere_date_id", "premiere_date", "id"),
+        db.Index("ix_films_director_id_id", "director_id", "id"),
+        db.Index("ix_films_director_id_rating_id", "director_id", "rating", "id"),
+        db.Index("ix_films_director_id_premiere_date_id", "director_id", "premiere_date", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -77,10 +93,31 @@ class Film(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     user = db.relationship("User")
 
-    genres = db.relationship("Genre", secondary=film_genres)
+    genres = db.relationship("Genre", secondary=film_genres, order_by="Genre.id")
 
     director_id = db.Column(db.Integer, db.ForeignKey("directors.id", ondelete="SET NULL"), nullable=True)
     director = db.relationship("Director")
 
     def __repr__(self):
         return f"<Film title={self.title}, premiere_date={self.premiere_date}>"
+
+
+# SQLite full text search index of films, Postgres keeps films.search_vector column maintained by migration.
+FILMS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE films_fts USING fts5(title, description, content='films', content_rowid='id', "
+    "prefix='2 3')",
+    "CREATE TRIGGER films_fts_insert AFTER INSERT ON films BEGIN "
+    "INSERT INTO films_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER films_fts_delete AFTER DELETE ON films BEGIN "
+    "INSERT INTO films_fts(films_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER films_fts_update AFTER UPDATE OF title, description ON films BEGIN "
+    "INSERT INTO films_fts(films_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO films_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+]
+
+for statement in FILMS_FTS_DDL:
+    event.listen(Film.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(Film.__table__, "before_drop", DDL("DROP TABLE IF EXISTS films_fts").execute_if(dialect="sqlite"))
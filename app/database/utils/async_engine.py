@@ -0,0 +1,65 @@
+"""Async engines and sessions of ASGI serving mode.
+
+Async engine connects to SQLALCHEMY_ASYNC_DATABASE_URI if it is set, otherwise to SQLALCHEMY_DATABASE_URI with
+the async driver of its dialect from ASYNC_DRIVERS, which should be installed. In-memory SQLite databases are not
+shared between sync and async engines.
+"""
+
+from sqlalchemy.engine import make_url, URL
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+
+from app import app
+
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+    "mysql": "aiomysql"
+}
+
+# Options of pools SQLite engines are not created with.
+POOL_SIZE_OPTIONS = ("pool_size", "max_overflow", "pool_timeout")
+
+_engines = {}
+
+
+def async_database_url(uri: str) -> URL:
+    """Returns url of database uri with async driver of its dialect."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError("There is no async driver for {} database.".format(backend))
+
+    return url.set(drivername="{}+{}".format(backend, ASYNC_DRIVERS[backend]))
+
+
+def async_engine() -> AsyncEngine:
+    """Returns async engine of configured database, created on first use with SQLALCHEMY_ENGINE_OPTIONS."""
+    url = make_url(app.config.get("SQLALCHEMY_ASYNC_DATABASE_URI")) \
+        if app.config.get("SQLALCHEMY_ASYNC_DATABASE_URI") \
+        else async_database_url(app.config["SQLALCHEMY_DATABASE_URI"])
+
+    engine = _engines.get(url)
+
+    if engine is None:
+        options = dict(app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+
+        if url.get_backend_name() == "sqlite":
+            options = {option: value for option, value in options.items() if option not in POOL_SIZE_OPTIONS}
+
+        engine = _engines[url] = create_async_engine(url, **options)
+
+    return engine
+
+
+def async_session() -> AsyncSession:
+    """Returns new async session of configured database."""
+    return AsyncSession(async_engine(), expire_on_commit=False)
+
+
+async def dispose_async_engines():
+    """Closes connections of all async engines."""
+    for engine in _engines.values():
+        await engine.dispose()
+
+    _engines.clear()
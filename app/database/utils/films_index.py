@@ -0,0 +1,216 @@
+"""In-process columnar index of films.
+
+Index keeps films columns used by filters and sorts in numpy arrays, evaluates FilmsQuerySchema with vectorized
+masks and sorts and returns ids of films page, so only the page rows are fetched from the database.
+It is optional: films_index is None unless numpy is installed and FILMS_INDEX_ENABLED is set.
+
+Index is loaded on first use, updated in place by FilmsCRUD writes of this process and reloaded when films change
+counter shows writes made by other processes.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import select
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app import app
+from app.database.models import Film, film_genres
+from app.database.utils.versions import get_table_versions
+from app.schemas.films import FilmsQuerySchema
+
+
+class FilmsColumns(NamedTuple):
+    """Films columns ordered by id, genres is a matrix of films rows and genres ids columns."""
+    ids: Any
+    ratings: Any
+    premiere_dates: Any
+    directors_ids: Any
+    genres: Any
+
+
+def _date_ordinal(value) -> int:
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d")
+
+    return value.toordinal()
+
+
+class FilmsIndex:
+    """Columnar index of films."""
+
+    def __init__(self):
+        self.version = None
+        self._columns = None
+        self._lock = threading.Lock()
+
+    def load(self, session, version: Optional[int] = None):
+        """Loads films columns from database."""
+        if version is None:
+            version = get_table_versions(session, ("films",))["films"][0]
+
+        films = session.execute(
+            select(Film.id, Film.rating, Film.premiere_date, Film.director_id).order_by(Film.id)
+        ).all()
+        films_genres = session.execute(select(film_genres.c.film_id, film_genres.c.genre_id)).all()
+
+        ids = np.array([film.id for film in films], dtype=np.int64)
+        genres = np.zeros((len(films), max((genre_id for _, genre_id in films_genres), default=0) + 1), dtype=bool)
+
+        if films_genres:
+            films_ids, genres_ids = np.array(films_genres, dtype=np.int64).T
+            genres[np.searchsorted(ids, films_ids), genres_ids] = True
+
+        columns = FilmsColumns(
+            ids=ids,
+            ratings=np.array([film.rating for film in films], dtype=np.int16),
+            premiere_dates=np.array([film.premiere_date.toordinal() for film in films], dtype=np.int32),
+            directors_ids=np.array([film.director_id or 0 for film in films], dtype=np.int64),
+            genres=genres
+        )
+
+        with self._lock:
+            self._columns = columns
+            self.version = version
+
+    def _fresh_columns(self, session) -> FilmsColumns:
+        version = get_table_versions(session, ("films",))["films"][0]
+
+        if version != self.version:
+            self.load(session, version)
+
+        return self._columns
+
+    def _apply(self, session, change):
+        """Applies change to columns after a write of this process committed.
+
+        Index is dropped and reloaded by the next read if films were also changed by someone else since it was
+        loaded.
+        """
+        with self._lock:
+            if self._columns is None or self.version is None:
+                return
+
+            expected_version = self.version + 1
+            version = get_table_versions(session, ("films",))["films"][0]
+
+            if version != expected_version:
+                self._columns, self.version = None, None
+                return
+
+            self._columns = change(self._columns)
+            self.version = version
+
+    def upsert(self, session, film: Film):
+        """Adds or updates film after it has been committed."""
+        def change(columns: FilmsColumns) -> FilmsColumns:
+            genres_ids = [genre.id for genre in film.genres]
+            genres = columns.genres
+
+            if genres_ids and max(genres_ids) >= genres.shape[1]:
+                genres = np.pad(genres, ((0, 0), (0, max(genres_ids) + 1 - genres.shape[1])))
+
+            genres_row = np.zeros(genres.shape[1], dtype=bool)
+            genres_row[genres_ids] = True
+
+            values = (film.id, film.rating, film.premiere_date.toordinal(), film.director_id or 0)
+            position = np.searchsorted(columns.ids, film.id)
+
+            if position < len(columns.ids) and columns.ids[position] == film.id:
+                arrays = [array.copy() for array in columns[:4]] + [genres.copy()]
+
+                for array, value in zip(arrays, values + (genres_row,)):
+                    array[position] = value
+
+                return FilmsColumns(*arrays)
+
+            return FilmsColumns(
+                *(np.insert(array, position, value) for array, value in zip(columns[:4], values)),
+                genres=np.insert(genres, position, genres_row, axis=0)
+            )
+
+        self._apply(session, change)
+
+    def remove(self, session, film_id: int):
+        """Removes film after its deletion has been committed."""
+        def change(columns: FilmsColumns) -> FilmsColumns:
+            position = np.searchsorted(columns.ids, film_id)
+
+            if position == len(columns.ids) or columns.ids[position] != film_id:
+                return columns
+
+            return FilmsColumns(*(np.delete(array, position, axis=0) for array in columns))
+
+        self._apply(session, change)
+
+    def select_ids(self, session, data: FilmsQuerySchema, limit: int,
+                   cursor_position: Optional[tuple[Any, int]] = None) -> Optional[list[int]]:
+        """Returns ids of films page matching query parameters in films_ordering_sorting order.
+
+        Page follows cursor_position (last sort value and last id) if passed. Returns None for queries index can't
+        evaluate: full text search and all films selection.
+        """
+        if data.search or data.sort_by == "relevance" or (data.page == -1 and cursor_position is None):
+            return None
+
+        columns = self._fresh_columns(session)
+        mask = np.ones(len(columns.ids), dtype=bool)
+
+        if data.director_id:
+            mask &= columns.directors_ids == data.director_id
+
+        if data.rating:
+            mask &= columns.ratings == data.rating
+
+        if data.start_premiere_date:
+            mask &= columns.premiere_dates >= _date_ordinal(data.start_premiere_date)
+
+        if data.end_premiere_date:
+            mask &= columns.premiere_dates <= _date_ordinal(data.end_premiere_date)
+
+        if data.genres_ids:
+            genres_ids = [int(genre_id) for genre_id in data.genres_ids.split(",")]
+            genres_ids = [genre_id for genre_id in genres_ids if 0 <= genre_id < columns.genres.shape[1]]
+            mask &= columns.genres[:, genres_ids].any(axis=1)
+
+        if data.sort_by == "rating":
+            sort_column = columns.ratings
+        elif data.sort_by == "premiere_date":
+            sort_column = columns.premiere_dates
+        else:
+            sort_column = columns.ids
+
+        descending = data.sort_order == -1
+
+        if cursor_position is not None:
+            last_value, last_id = cursor_position
+
+            if data.sort_by == "premiere_date":
+                last_value = _date_ordinal(last_value)
+
+            following = sort_column < last_value if descending else sort_column > last_value
+
+            if sort_column is not columns.ids:
+                following |= (sort_column == last_value) & (columns.ids > last_id)
+
+            mask &= following
+
+        positions = np.flatnonzero(mask)
+
+        if sort_column is columns.ids:
+            order = positions[::-1] if descending else positions
+        else:
+            keys = sort_column[positions].astype(np.int64)
+            order = positions[np.lexsort((columns.ids[positions], -keys if descending else keys))]
+
+        offset = 0 if cursor_position is not None else ((data.page or 1) - 1) * limit
+
+        return columns.ids[order[offset:offset + limit]].tolist()
+
+
+films_index = FilmsIndex() if np is not None and app.config["FILMS_INDEX_ENABLED"] else None
@@ -1,13 +1,109 @@
 """Module implements orm utils."""
 
-from app.database.models import Film, Genre
+import re
 
+from sqlalchemy import and_, or_, false, func, select, table, column, literal_column, literal, extract, union_all, \
+    cast, Integer
+from sqlalchemy.orm import joinedload, selectinload, lazyload, raiseload, load_only
 
-def films_search_filter(query: Film.query, search: str) -> Film.query:
+from app import db
+from app.database.models import Film, film_genres
+
+LOADING_STRATEGIES = {
+    "joined": joinedload,
+    "selectin": selectinload,
+    "lazy": lazyload,
+    "raise": raiseload
+}
+
+FILMS_DEFAULT_LOADING = {
+    "director": "joined",
+    "user": "joined",
+    "genres": "selectin"
+}
+
+# Integers SQL columns can hold, values out of signed 64-bit range can't be bound to queries.
+SQL_INTEGERS_RANGE = range(-2 ** 63, 2 ** 63)
+
+films_fts = table("films_fts", column("rowid"))
+films_fts_column = literal_column("films_fts")
+films_search_vector = literal_column("films.search_vector")
+
+
+def films_ts_query(tokens, in_description):
+    """Returns Postgres tsquery matching words prefixes in title (and description)."""
+    weights = "AB" if in_description else "A"
+    return func.to_tsquery("simple", " & ".join("{}:*{}".format(token, weights) for token in tokens))
+
+
+def films_fts_match(tokens, in_description):
+    """Returns SQLite films_fts MATCH condition for words prefixes in title (and description)."""
+    columns = "{title description}" if in_description else "title"
+    return films_fts_column.match(" AND ".join('{} : "{}"*'.format(columns, token) for token in tokens))
+
+
+def search_tokens(search: str) -> list[str]:
+    """Splits search string into lowercase words."""
+    return re.findall(r"[^\W_]+", search.lower())
+
+
+def films_search_condition(search: str, in_description: bool = False):
+    """Returns full text search condition matching films which words start with every search word.
+
+    Postgres uses GIN indexed films.search_vector (title weighted A, description B),
+    SQLite uses films_fts table, other dialects fall back to LIKE.
+    """
+    tokens = search_tokens(search)
+
+    if not tokens:
+        return false()
+
+    dialect = db.engine.dialect.name
+
+    if dialect == "postgresql":
+        return films_search_vector.op("@@")(films_ts_query(tokens, in_description))
+
+    if dialect == "sqlite":
+        return Film.id.in_(select(films_fts.c.rowid).where(films_fts_match(tokens, in_description)))
+
+    conditions = []
+    for token in tokens:
+        condition = Film.title.ilike("%{}%".format(token))
+
+        if in_description:
+            condition = or_(condition, Film.description.ilike("%{}%".format(token)))
+
+        conditions.append(condition)
+
+    return and_(*conditions)
+
+
+def films_search_filter(query: Film.query, search: str, in_description: bool = False) -> Film.query:
     """Filters films by search field."""
     if search:
-        search_like = "%{}%".format(search)
-        query = query.filter(Film.title.ilike(search_like))
+        query = query.filter(films_search_condition(search, in_description))
+
+    return query
+
+
+def films_search_ranking(query, search, in_description=False):
+    """Orders films by search relevance, the most relevant first."""
+    tokens = search_tokens(search) if search else []
+
+    if not tokens:
+        return query
+
+    dialect = db.engine.dialect.name
+
+    if dialect == "postgresql":
+        return query.order_by(func.ts_rank(films_search_vector, films_ts_query(tokens, in_description)).desc())
+
+    if dialect == "sqlite":
+        rank = select(func.bm25(films_fts_column, 10.0, 1.0)) \
+            .where(films_fts.c.rowid == Film.id, films_fts_match(tokens, in_description)) \
+            .scalar_subquery()
+
+        return query.order_by(rank.asc())
 
     return query
 
@@ -40,26 +136,92 @@ def films_premiere_date_filter(query, start_premiere_date, end_premiere_date):
 
 
 def films_genres_ids_filter(query, genres_ids):
-    """Filters films by genres ids."""
+    """Filters films by genres ids, ids out of SQL integers range match no genre and are dropped."""
     if genres_ids:
-        query = query.filter(Film.genres.any(Genre.id.in_(genres_ids.split(","))))
+        genres_ids = [int(genre_id) for genre_id in genres_ids.split(",") if int(genre_id) in SQL_INTEGERS_RANGE]
+        films_ids = select(film_genres.c.film_id).where(film_genres.c.genre_id.in_(genres_ids))
+        query = query.filter(Film.id.in_(films_ids))
 
     return query
 
 
-def films_ordering_sorting(query, sort_by, sort_order):
-    """Sorts films by specified field with specified order."""
-    order_field = Film.id
-
+def films_sort_field(sort_by):
+    """Returns films column to sort by."""
     if sort_by == "rating":
-        order_field = Film.rating
+        return Film.rating
     elif sort_by == "premiere_date":
-        order_field = Film.premiere_date
+        return Film.premiere_date
+
+    return Film.id
+
+
+def films_ordering_sorting(query, sort_by, sort_order):
+    """Sorts films by specified field with specified order, ties are ordered by id."""
+    order_field = films_sort_field(sort_by)
 
     order_by = order_field.asc()
 
     if sort_order == -1:
         order_by = order_field.desc()
 
-    return query.order_by(order_by)
+    if order_field is Film.id:
+        return query.order_by(order_by)
+
+    return query.order_by(order_by, Film.id.asc())
+
+
+def films_cursor_filter(query, sort_by, sort_order, last_value, last_id):
+    """Filters films following (last_value, last_id) position in films_ordering_sorting order."""
+    order_field = films_sort_field(sort_by)
+
+    if sort_order == -1:
+        following = order_field < last_value
+    else:
+        following = order_field > last_value
+
+    if order_field is Film.id:
+        return query.filter(following)
+
+    return query.filter(or_(following, and_(order_field == last_value, Film.id > last_id)))
+
+
+def films_relationships_loading(query, loading):
+    """Applies loading strategies to films relationships."""
+    for relationship, strategy in loading.items():
+        query = query.options(LOADING_STRATEGIES[strategy](getattr(Film, relationship)))
+
+    return query
+
+
+def films_fields_loading(query, loading, fields):
+    """Loads only requested films columns and relationships, other relationships are not loaded at all."""
+    columns = [getattr(Film, field) for field in fields if field not in loading]
+    query = query.options(load_only(*columns))
+
+    return films_relationships_loading(query, {
+        relationship: strategy for relationship, strategy in loading.items() if relationship in fields
+    })
+
+
+# Facet name and the key of facet value in films facets.
+FILMS_FACETS = {"genres": "id", "directors": "id", "ratings": "rating", "years": "year"}
+
+
+def films_facets_query(films_ids_query):
+    """Returns UNION ALL query of (facet, value, count) rows counting films selected by films_ids_query."""
+    films_ids = films_ids_query.subquery()
+    year = cast(extract("year", Film.premiere_date), Integer)
+
+    genres = select(literal("genres").label("facet"), film_genres.c.genre_id.label("value"),
+                    func.count().label("count")) \
+        .where(film_genres.c.film_id.in_(select(films_ids.c.id))) \
+        .group_by(film_genres.c.genre_id)
+
+    directors, ratings, years = (
+        select(literal(facet), column, func.count()).where(Film.id.in_(select(films_ids.c.id))).group_by(column)
+        for facet, column in (("directors", Film.director_id), ("ratings", Film.rating), ("years", year))
+    )
+
+    facets = union_all(genres, directors, ratings, years).subquery()
 
+    return select(facets.c.facet, facets.c.value, facets.c.count).order_by(facets.c.facet, facets.c.value)
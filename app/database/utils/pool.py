@@ -0,0 +1,103 @@
+"""Connections pool instrumentation.
+
+InstrumentedQueuePool counts connections opened, checked out and in use with pool events and records time of
+checkouts, which includes waiting for a free connection and opening of overflow ones, and checkouts timeouts.
+RoutingSQLAlchemy makes engines use InstrumentedQueuePool unless SQLite needs other pool.
+"""
+
+import time
+import threading
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolStats:
+    """Counters of pool connections usage."""
+
+    def __init__(self):
+        self.connections = 0
+        self.checkouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+        self._lock = threading.Lock()
+
+    def connected(self, *_):
+        with self._lock:
+            self.connections += 1
+
+    def checked_out(self, *_):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def checked_in(self, *_):
+        with self._lock:
+            self.in_use -= 1
+
+    def waited(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_time += seconds
+            self.max_wait_time = max(self.max_wait_time, seconds)
+            self.timeouts += timed_out
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool keeping usage counters in stats.
+
+    Pool recreated by engine dispose shares stats with the disposed one, connections of which can still be in use.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self._getting = threading.local()
+
+        # Recreated pools get listeners with dispatch of the pool they replace and its stats.
+        if not kwargs.get("_dispatch"):
+            event.listen(self, "connect", self.stats.connected)
+            event.listen(self, "checkout", self.stats.checked_out)
+            event.listen(self, "checkin", self.stats.checked_in)
+
+    def _do_get(self):
+        # QueuePool._do_get calls itself on races for overflow, only the outer call is timed.
+        if getattr(self._getting, "active", False):
+            return super()._do_get()
+
+        self._getting.active = True
+        start = time.perf_counter()
+        timed_out = False
+
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self._getting.active = False
+            self.stats.waited(time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+
+        return pool
+
+
+def pool_stats(pool: Pool) -> dict[str, Any]:
+    """Returns pool class, size and usage counters, counters are None for not instrumented pools."""
+    stats = getattr(pool, "stats", None)
+    counters = ("in_use", "max_in_use", "connections", "checkouts", "timeouts", "wait_time", "max_wait_time")
+
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size() if isinstance(pool, QueuePool) else None,
+        "overflow": pool.overflow() if isinstance(pool, QueuePool) else None,
+        **{counter: getattr(stats, counter, None) for counter in counters}
+    }
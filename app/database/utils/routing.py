@@ -0,0 +1,111 @@
+"""Routing of reads to read replicas.
+
+Replicas are SQLALCHEMY_BINDS under REPLICA_BIND_PREFIX keys, so their engines get the same options and driver
+setup as the primary one. Sessions of GET and HEAD requests read from a replica picked round-robin once per session.
+Writes go to the primary, and the session sticks to it after its first flush. Client which wrote to the primary
+reads from it for DB_PRIMARY_STICKY_SECONDS too, so it sees its own writes regardless of replication lag.
+Module doesn't import app, so configs can use replicas_binds.
+"""
+
+import time
+import itertools
+from typing import Optional
+
+from flask import current_app, request, session as flask_session, has_request_context
+from flask_sqlalchemy import SQLAlchemy, SignallingSession, get_state
+from sqlalchemy import event, orm
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.database.utils.pool import InstrumentedQueuePool
+
+REPLICA_BIND_PREFIX = "replica_"
+READ_METHODS = ("GET", "HEAD")
+
+
+def replicas_binds(uris: Optional[str]) -> dict[str, str]:
+    """Returns binds of comma separated replicas uris."""
+    uris = [uri.strip() for uri in (uris or "").split(",") if uri.strip()]
+
+    return {"{}{}".format(REPLICA_BIND_PREFIX, number): uri for number, uri in enumerate(uris)}
+
+
+class RoutingSession(SignallingSession):
+    """Session binding reads of GET and HEAD requests to replicas."""
+
+    def __init__(self, db, **options):
+        super().__init__(db, **options)
+        self._db = db
+        self._replica = None
+        self._wrote = False
+
+    def _pick_replica(self):
+        replicas = [bind for bind in self.app.config["SQLALCHEMY_BINDS"] or {}
+                    if bind.startswith(REPLICA_BIND_PREFIX)]
+
+        if not replicas or not has_request_context() or request.method not in READ_METHODS:
+            return None
+
+        if flask_session.get("db_primary_until", 0) > time.time():
+            return None
+
+        return self._db.get_engine(self.app, bind=replicas[next(self._db.replicas_counter) % len(replicas)])
+
+    def stick_to_primary(self):
+        """Binds session and, for a while, sessions of the client of current request to primary."""
+        if self._wrote:
+            return
+
+        self._wrote = True
+        self._replica = False
+
+        if has_request_context():
+            flask_session["db_primary_until"] = time.time() + current_app.config["DB_PRIMARY_STICKY_SECONDS"]
+
+    def get_bind(self, mapper=None, clause=None):
+        if isinstance(clause, UpdateBase):
+            self.stick_to_primary()
+
+        if self._replica is None:
+            self._replica = self._pick_replica() or False
+
+        if self._replica is False or self._flushing:
+            return super().get_bind(mapper, clause)
+
+        return self._replica
+
+    def close(self):
+        super().close()
+        self._replica = None
+        self._wrote = False
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stick_to_primary_after_flush(session, flush_context):
+    session.stick_to_primary()
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """SQLAlchemy with sessions routing reads to replicas and instrumented pools."""
+
+    def __init__(self, *args, **kwargs):
+        self.replicas_counter = itertools.count()
+        super().__init__(*args, **kwargs)
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        """Makes engines use InstrumentedQueuePool unless other pool is configured or required for SQLite."""
+        sa_url, options = super().apply_driver_hacks(app, sa_url, options)
+        options.setdefault("poolclass", InstrumentedQueuePool)
+
+        return sa_url, options
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def dispose_engines(self, app=None, close: bool = True):
+        """Disposes pools of primary and replicas engines.
+
+        With close=False pooled connections are dropped without closing, as forked processes should do with
+        connections inherited from parent.
+        """
+        for connector in get_state(self.get_app(app)).connectors.values():
+            connector.get_engine().dispose(close=close)
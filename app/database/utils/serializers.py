@@ -0,0 +1,104 @@
+"""Serializers of core result rows into dicts equal to pydantic schemas output.
+
+They skip pydantic validation and ORM objects creation, so are used on hot list endpoints.
+"""
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from app.database.models import Film, Director, User, Genre
+
+FILMS_FIELDS = ("id", "title", "premiere_date", "description", "rating", "poster_url", "director", "user", "genres")
+
+FILMS_FIELDS_COLUMNS = {
+    "id": (Film.id,),
+    "title": (Film.title,),
+    "premiere_date": (Film.premiere_date,),
+    "description": (Film.description,),
+    "rating": (Film.rating,),
+    "poster_url": (Film.poster_url,),
+    "director": (Director.first_name.label("director_first_name"), Director.last_name.label("director_last_name"),
+                 Director.id.label("director_id")),
+    "user": (User.id.label("user_id"), User.username.label("user_username")),
+    "genres": ()
+}
+
+GENRES_COLUMNS = (Genre.name, Genre.id)
+
+
+def _column_getter(index):
+    return lambda row: row[index]
+
+
+def _premiere_date_getter(index):
+    return lambda row: str(row[index])
+
+
+def _director_getter(index):
+    def getter(row):
+        if row[index + 2] is None:
+            return "unknown"
+
+        return {"first_name": row[index], "last_name": row[index + 1], "id": row[index + 2]}
+
+    return getter
+
+
+def _user_getter(index):
+    return lambda row: {"id": row[index], "username": row[index + 1]}
+
+
+FIELDS_GETTERS = {
+    "premiere_date": _premiere_date_getter,
+    "director": _director_getter,
+    "user": _user_getter
+}
+
+
+class FilmsRowSerializer:
+    """Serializer of films rows selected with columns into dicts equal to FilmSchema.dict().
+
+    Genres are not selected with film row and are passed to serializer mapped by film id.
+    """
+
+    def __init__(self, fields: tuple[str, ...]):
+        self.fields = tuple(field for field in FILMS_FIELDS if field in fields)
+        self.with_genres = "genres" in self.fields
+        self.with_director = "director" in self.fields
+        self.with_user = "user" in self.fields
+
+        self.columns = []
+        self._getters = []
+
+        for field in self.fields:
+            if field == "genres":
+                continue
+
+            getter = FIELDS_GETTERS.get(field, _column_getter)
+            self._getters.append((field, getter(len(self.columns))))
+            self.columns.extend(FILMS_FIELDS_COLUMNS[field])
+
+        self._id_index = self.columns.index(Film.id)
+
+    def film_id(self, row) -> int:
+        """Returns id of film row."""
+        return row[self._id_index]
+
+    def __call__(self, row, genres: Optional[dict[int, list[dict[str, Any]]]] = None) -> dict[str, Any]:
+        film = {field: getter(row) for field, getter in self._getters}
+
+        if self.with_genres:
+            film["genres"] = genres.get(row[self._id_index], [])
+
+        return film
+
+
+@lru_cache(maxsize=None)
+def films_row_serializer(fields: Optional[tuple[str, ...]] = None) -> FilmsRowSerializer:
+    """Returns serializer of films rows with fields, all fields if not passed."""
+    return FilmsRowSerializer(fields or FILMS_FIELDS)
+
+
+def genre_row_to_dict(row) -> dict[str, Any]:
+    """Returns genre row selected with GENRES_COLUMNS as dict equal to GenreSchema.dict()."""
+    return {"name": row[0], "id": row[1]}
@@ -0,0 +1,37 @@
+"""Module implements table-level change counters."""
+
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.database.models import ChangeCounter
+
+
+def bump_table_versions(session: Session, tables: tuple[str, ...]):
+    """Increments change counters of tables within session transaction."""
+    now = datetime.utcnow().replace(microsecond=0)
+
+    for table_name in tables:
+        updated = session.execute(
+            update(ChangeCounter)
+            .where(ChangeCounter.table_name == table_name)
+            .values(version=ChangeCounter.version + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        if not updated:
+            session.add(ChangeCounter(table_name=table_name, version=1, updated_at=now))
+
+
+def get_table_versions(session: Session, tables: tuple[str, ...]) -> dict[str, tuple[int, datetime]]:
+    """Returns (version, updated_at) of tables, tables that were never changed have version 0."""
+    rows = session.execute(
+        select(ChangeCounter.table_name, ChangeCounter.version, ChangeCounter.updated_at)
+        .where(ChangeCounter.table_name.in_(tables))
+    ).all()
+
+    versions = {table_name: (0, None) for table_name in tables}
+    versions.update({row.table_name: (row.version, row.updated_at) for row in rows})
+
+    return versions
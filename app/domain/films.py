@@ -1,24 +1,23 @@
 """Module implements films domain."""
 
 from functools import wraps
+from typing import Any, Optional, Iterator, Union
 
 from flask_login import current_user
 
 from app.schemas.films import FilmsQuerySchema, FilmSchema, FilmWithUserIdBodySchema, FilmBodySchema
-from app.database.cruds.films import FilmsCRUD
 from app.database.cruds.base import AbstractCRUD
 
-from app.utils.exceptions import UnauthorizedError
+from app.utils.exceptions import UnauthorizedError, EntityIdError
 
 
 def check_access(func):
     """Checks for auth and if a user is author of film or is admin."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        film_id = args[1]
-        film = FilmsCRUD().read_one(film_id)
+        crud, film_id = args[:2]
 
-        if film.user.id != current_user.id and not current_user.is_admin():
+        if crud.read_user_id(film_id) != current_user.id and not current_user.is_admin():
             raise UnauthorizedError()
 
         return func(*args, **kwargs)
@@ -32,6 +31,26 @@ def get_all_films(crud: AbstractCRUD, data: FilmsQuerySchema) -> list[FilmSchema
     return films
 
 
+def get_all_films_dicts(crud: AbstractCRUD, data: FilmsQuerySchema) -> list[dict[str, Any]]:
+    """Returns from crud films as dicts."""
+    return crud.read_dicts(data)
+
+
+def stream_all_films(crud: AbstractCRUD, data: FilmsQuerySchema) -> Iterator[dict[str, Any]]:
+    """Yields from crud all films matching query as dicts."""
+    yield from crud.read_dicts_iter(data)
+
+
+def get_films_next_cursor(crud: AbstractCRUD, films: list[dict[str, Any]], data: FilmsQuerySchema) -> Optional[str]:
+    """Returns from crud cursor of the films page following films."""
+    return crud.next_cursor(films, data)
+
+
+def get_films_facets(crud: AbstractCRUD, data: FilmsQuerySchema) -> dict[str, list[dict[str, Any]]]:
+    """Returns from crud films counts per facet."""
+    return crud.facets(data)
+
+
 def get_one_film(crud: AbstractCRUD, film_id: int) -> FilmSchema:
     """Returns from crud a specific film."""
     film = crud.read_one(film_id)
@@ -44,6 +63,11 @@ def create_film(crud: AbstractCRUD, data: FilmWithUserIdBodySchema) -> FilmSchem
     return film
 
 
+def create_films(crud: AbstractCRUD, data: list[FilmWithUserIdBodySchema]) -> list[Union[int, EntityIdError]]:
+    """Creates films by crud, returns for each film its id or error."""
+    return crud.bulk_create(data)
+
+
 @check_access
 def update_film(crud: AbstractCRUD, film_id: int, data: FilmBodySchema) -> FilmSchema:
     """Updates a film by crud."""
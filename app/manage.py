@@ -8,7 +8,7 @@ from datetime import datetime
 
 from faker import Faker
 
-from werkzeug.security import generate_password_hash
+from app.utils.passwords import hash_password
 
 from app import app, db
 from app.database.models import Genre, Director, Film, User, Role
@@ -33,7 +33,7 @@ def db_init():
 
     db.session.refresh(admin_role)
 
-    admin_user = User(username="admin", password=generate_password_hash(app.config["ADMIN_PASSWORD"]),
+    admin_user = User(username="admin", password=hash_password(app.config["ADMIN_PASSWORD"]),
                       role_id=admin_role.id)
 
     db.session.add(admin_user)
@@ -84,7 +84,7 @@ def seed_role():
 def seed_user():
     name = faker_.name().split(" ")
     username = "{}_{}_{}".format(name[0], name[1], faker_.pyint())
-    password_hash = generate_password_hash("123")
+    password_hash = hash_password("123")
 
     user = User(username=username, password=password_hash, role_id=admin_role_id)
 
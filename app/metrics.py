@@ -0,0 +1,103 @@
+"""Module implements requests metrics in Prometheus format.
+
+Requests latency, counts by status, responses sizes and in-flight requests are recorded per endpoint, labelled
+with restx namespace, resource and method, and exposed at /metrics. Metrics are optional: they are recorded only
+if prometheus_client is installed (metrics extra) and METRICS_ENABLED is set, enabled metrics without
+prometheus_client are logged as a warning on startup.
+
+Gunicorn workers should be started with PROMETHEUS_MULTIPROC_DIR env set to an empty directory, then each worker
+writes its metrics to files there and /metrics aggregates files of all workers.
+"""
+
+import os
+import time
+from functools import lru_cache
+
+from flask import g, request, Response
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess, Counter, Histogram, Gauge
+except ImportError:
+    prometheus_client = None
+
+from app import app, api
+
+LABELS = ("namespace", "resource", "method")
+
+RESPONSE_SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+if prometheus_client is None and app.config["METRICS_ENABLED"]:
+    app.logger.warning("METRICS_ENABLED is set, but prometheus_client is not installed, metrics are not recorded "
+                       "and /metrics is not served. Install it with poetry install -E metrics.")
+
+if prometheus_client:
+    requests_total = Counter("http_requests_total", "Requests count.", LABELS + ("status",))
+    request_duration = Histogram("http_request_duration_seconds", "Requests latency.", LABELS)
+    requests_in_flight = Gauge("http_requests_in_flight", "Requests being processed.", LABELS,
+                               multiprocess_mode="livesum")
+    response_size = Histogram("http_response_size_bytes", "Responses bodies sizes, streamed ones are not counted.",
+                              LABELS, buckets=RESPONSE_SIZE_BUCKETS)
+
+
+@lru_cache(maxsize=None)
+def endpoint_labels(endpoint: str) -> tuple[str, str]:
+    """Returns namespace and resource names of endpoint, routes out of restx namespaces have empty namespace."""
+    view_class = getattr(app.view_functions.get(endpoint), "view_class", None)
+
+    for namespace in api.namespaces:
+        if any(resource.resource is view_class for resource in namespace.resources):
+            return namespace.name, view_class.__name__
+
+    return "", endpoint or "unmatched"
+
+
+def _enabled() -> bool:
+    return prometheus_client is not None and app.config["METRICS_ENABLED"]
+
+
+@app.before_request
+def start_request_metrics():
+    if not _enabled():
+        return
+
+    g.metrics_labels = endpoint_labels(request.endpoint) + (request.method,)
+    g.metrics_start = time.perf_counter()
+
+    requests_in_flight.labels(*g.metrics_labels).inc()
+
+
+@app.after_request
+def record_request_metrics(response):
+    labels = g.get("metrics_labels")
+
+    if labels:
+        request_duration.labels(*labels).observe(time.perf_counter() - g.metrics_start)
+        requests_total.labels(*labels, response.status_code).inc()
+
+        if not response.is_streamed:
+            response_size.labels(*labels).observe(response.calculate_content_length() or 0)
+
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(_):
+    labels = g.pop("metrics_labels", None)
+
+    if labels:
+        requests_in_flight.labels(*labels).dec()
+
+
+if prometheus_client:
+    @app.route("/metrics")
+    def metrics():
+        """Returns metrics of this process or, in multiprocess mode, of all processes."""
+        registry = prometheus_client.REGISTRY
+
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+
+        return Response(prometheus_client.generate_latest(registry),
+                        content_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,52 @@
+"""Module implements per-request SQL queries accounting.
+
+Engine events count queries of every engine and sum their time per request. In debug mode they are returned in
+X-DB-Queries and X-DB-Time (milliseconds) response headers. Queries longer than SLOW_QUERY_THRESHOLD seconds
+are logged with their parameters and route, 0 disables the log.
+"""
+
+import time
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import app
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("queries_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["queries_start"].pop()
+
+    if has_request_context():
+        g.db_queries = g.get("db_queries", 0) + 1
+        g.db_time = g.get("db_time", 0) + duration
+
+    threshold = app.config["SLOW_QUERY_THRESHOLD"]
+
+    if threshold and duration > threshold:
+        route = "{} {} ({})".format(request.method, request.path, request.endpoint) if has_request_context() \
+            else "no request"
+
+        app.logger.warning("Slow query took %.3f s in %s: %s; parameters: %r", duration, route, statement,
+                           parameters)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    if context.connection is not None and context.connection.info.get("queries_start"):
+        context.connection.info["queries_start"].pop()
+
+
+@app.after_request
+def add_queries_headers(response):
+    if app.debug:
+        response.headers["X-DB-Queries"] = str(g.get("db_queries", 0))
+        response.headers["X-DB-Time"] = "{:.3f}".format(g.get("db_time", 0) * 1000)
+
+    return response
@@ -14,6 +14,7 @@ from app.utils.logging.directors import log_created_director, log_updated_direct
 
 from app.resources.utils.responses import successful_response_message, not_found_request_response_message
 from app.resources.parsers.directors import directors_body_parser
+from app.resources.utils.conditional import conditional
 from app.resources.models.directors import director_response, directors_response, directors_body, \
     directors_add_response, directors_update_response, directors_delete_response
 
@@ -24,6 +25,8 @@ class DirectorsResource(Resource):
     """Directors resource."""
 
     @api.response(200, "Success", directors_response)
+    @api.response(304, "Not modified")
+    @conditional("directors")
     def get(self):
         """Returns directors."""
         crud = DirectorsCRUD()
@@ -57,6 +60,8 @@ class SingleDirectorsResource(Resource):
     """Single directors resource."""
 
     @api.response(200, "Success", director_response)
+    @api.response(304, "Not modified")
+    @conditional("directors")
     def get(self, director_id):
         """Returns director by id."""
         try:
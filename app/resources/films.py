@@ -1,45 +1,86 @@
 """Module implements films resources."""
 
+from flask import request
 from flask_restx import Resource, Namespace
 from flask_login import login_required, current_user
 
+from app import app, db
 from app.database.cruds.films import FilmsCRUD
+from app.database.utils.versions import get_table_versions
 
 from app.schemas.films import FilmsQuerySchema, FilmBodySchema, FilmWithUserIdBodySchema
 
-from app.domain.films import get_all_films, create_film, update_film, delete_film, get_one_film
+from app.domain.films import get_all_films_dicts, create_film, update_film, delete_film, get_one_film, \
+    get_films_next_cursor, stream_all_films, get_films_facets, create_films
 
-from app.utils.exceptions import EntityIdError, GenreIdError, DirectorIdError
-from app.utils.logging.films import log_created_film, log_updated_film, log_deleted_film
+from app.utils.exceptions import EntityIdError, GenreIdError, DirectorIdError, CursorError
+from app.utils.cache import LRUCache
+from app.utils.logging.films import log_created_film, log_created_films, log_updated_film, log_deleted_film
 
 from app.resources.utils.responses import successful_response_message, \
     bad_request_response_message, \
-    not_found_request_response_message
+    not_found_request_response_message, \
+    ndjson_response, \
+    NDJSON_MIMETYPE
+from app.resources.utils.conditional import conditional
+from app.resources.utils.requests import request_json_items
 
 from app.resources.models.films import films_response, films_body, films_add_response, films_update_response, \
-    film_response, films_delete_response
-from app.resources.parsers.films import films_query_parser, films_add_body_parser, films_update_body_parser
+    film_response, films_delete_response, films_facets_response, films_bulk_response
+from app.resources.parsers.films import films_query_parser, films_add_body_parser, films_update_body_parser, \
+    films_facets_query_parser, parse_films_bulk_items
 
 api = Namespace("films", "Films operations")
 
+# Films responses are cached under films change counter, so writes of any process make them stale.
+films_cache = LRUCache(app.config["FILMS_CACHE_SIZE"], app.config["FILMS_CACHE_TTL"], name="films")
+films_facets_cache = LRUCache(app.config["FILMS_CACHE_SIZE"], app.config["FILMS_CACHE_TTL"], name="films_facets")
+
+
+def films_generation(session) -> int:
+    """Returns films change counter, it should be read before the films query which result is cached."""
+    return get_table_versions(session, ("films",))["films"][0]
+
 
 @api.response(400, "Data validation error")
 class FilmsResource(Resource):
     """Films resource."""
 
     @api.expect(films_query_parser)
+    @api.produces(["application/json", NDJSON_MIMETYPE])
     @api.response(200, "Success", films_response)
     def get(self):
-        """Returns films."""
-        query = films_query_parser.parse_args()
+        """Returns films.
+
+        With Accept: application/x-ndjson all films matching query are streamed one per line, page and cursor
+        are ignored.
+        """
+        try:
+            query = FilmsQuerySchema.parse_obj(films_query_parser.parse_args())
+
+            crud = FilmsCRUD()
+
+            if request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+                return ndjson_response(stream_all_films(crud, query))
+
+            generation = films_generation(db.session)
+            response = films_cache.get(query.cache_key(), generation=generation)
+
+            if response is None:
+                films = get_all_films_dicts(crud, query)
 
-        crud = FilmsCRUD()
-        films = get_all_films(crud, FilmsQuerySchema.parse_obj(query))
+                response = {
+                    "count": len(films),
+                    "result": films,
+                    "next_cursor": get_films_next_cursor(crud, films, query)
+                }
 
-        return {
-            "count": len(films),
-            "result": [film.dict() for film in films]
-        }
+                films_cache.set(query.cache_key(), response, generation=generation)
+
+            return response
+
+        except CursorError as err:
+            return bad_request_response_message(err)
 
     @login_required
     @api.expect(films_body)
@@ -63,16 +104,77 @@ class FilmsResource(Resource):
             return bad_request_response_message(err)
 
 
+@api.response(400, "Data validation error")
+class FilmsBulkResource(Resource):
+    """Films bulk resource."""
+
+    @login_required
+    @api.expect([films_body])
+    @api.response(200, "Success", films_bulk_response)
+    @api.response(401, "Unauthenticated")
+    def post(self):
+        """Creates films from JSON array or newline delimited JSON (application/x-ndjson) body.
+
+        Every film is validated separately, films with errors are reported in result and others are created.
+        """
+        try:
+            items = parse_films_bulk_items(request_json_items())
+        except ValueError as err:
+            return bad_request_response_message(err)
+
+        films = [FilmWithUserIdBodySchema.parse_obj(item | {"user_id": current_user.id})
+                 for item in items if not isinstance(item, str)]
+
+        films_results = iter(create_films(FilmsCRUD(), films))
+        result = []
+
+        for index, item in enumerate(items):
+            item_result = item if isinstance(item, str) else next(films_results)
+
+            if isinstance(item_result, int):
+                result.append({"index": index, "id": item_result})
+            else:
+                result.append({"index": index, "message": str(item_result)})
+
+        created = sum("id" in item_result for item_result in result)
+
+        log_created_films(created)
+
+        return {"created": created, "failed": len(result) - created, "result": result}
+
+
+@api.response(400, "Data validation error")
+class FilmsFacetsResource(Resource):
+    """Films facets resource."""
+
+    @api.expect(films_facets_query_parser)
+    @api.response(200, "Success", films_facets_response)
+    def get(self):
+        """Returns counts of films matching filters per genre, director, rating and premiere year."""
+        query = FilmsQuerySchema.parse_obj(films_facets_query_parser.parse_args())
+
+        generation = films_generation(db.session)
+        facets = films_facets_cache.get(query.cache_key(), generation=generation)
+
+        if facets is None:
+            facets = get_films_facets(FilmsCRUD(), query)
+            films_facets_cache.set(query.cache_key(), facets, generation=generation)
+
+        return facets
+
+
 @api.doc(params={"film_id": "Film ID"})
 @api.response(404, "Film not found")
 class SingleFilmsResource(Resource):
     """Single film resource."""
 
     @api.response(200, "Success", film_response)
+    @api.response(304, "Not modified")
+    @conditional("films")
     def get(self, film_id):
         """Returns film by id."""
         try:
-            crud = FilmsCRUD()
+            crud = FilmsCRUD(loading={"genres": "joined"})
             film = get_one_film(crud, film_id)
 
             return film.dict()
@@ -121,4 +223,6 @@ class SingleFilmsResource(Resource):
 
 
 api.add_resource(FilmsResource, "/")
+api.add_resource(FilmsBulkResource, "/bulk")
+api.add_resource(FilmsFacetsResource, "/facets")
 api.add_resource(SingleFilmsResource, "/<int:film_id>")
@@ -16,6 +16,7 @@ from app.utils.logging.genres import log_created_genre, log_updated_genre, log_d
 from app.resources.models.genres import genres_response, genres_body, genres_add_response, genres_update_response, \
     genres_delete_response, genre_response
 from app.resources.parsers.genres import genres_body_parser
+from app.resources.utils.conditional import conditional
 
 api = Namespace("genres", "Genres operations")
 
@@ -24,6 +25,8 @@ class GenresResource(Resource):
     """Genres resource."""
 
     @api.response(200, "Success", genres_response)
+    @api.response(304, "Not modified")
+    @conditional("genres")
     def get(self):
         """Returns genres."""
         crud = GenresCRUD()
@@ -61,6 +64,8 @@ class SingleGenresResource(Resource):
     """Single genres resource."""
 
     @api.response(200, "Success", genre_response)
+    @api.response(304, "Not modified")
+    @conditional("genres")
     def get(self, genre_id):
         """Returns genre by id."""
         try:
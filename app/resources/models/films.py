@@ -22,7 +22,27 @@ film_response = api.model("Film", {
 
 films_response = api.model("Films Response", {
     "count": fields.Integer,
-    "result": fields.List(fields.Nested(film_response))
+    "result": fields.List(fields.Nested(film_response)),
+    "next_cursor": fields.String(example="WyJpZCIsMTAsMTBd")
+})
+
+films_facets_response = api.model("Films Facets Response", {
+    "genres": fields.List(fields.Nested(api.model("Genre Facet", {
+        "id": fields.Integer(example=1),
+        "count": fields.Integer(example=10)
+    }))),
+    "directors": fields.List(fields.Nested(api.model("Director Facet", {
+        "id": fields.Integer(example=1, description="null for films with unknown director"),
+        "count": fields.Integer(example=10)
+    }))),
+    "ratings": fields.List(fields.Nested(api.model("Rating Facet", {
+        "rating": fields.Integer(example=10),
+        "count": fields.Integer(example=10)
+    }))),
+    "years": fields.List(fields.Nested(api.model("Premiere Year Facet", {
+        "year": fields.Integer(example=2010),
+        "count": fields.Integer(example=10)
+    })))
 })
 
 films_body = api.model("Films Request", {
@@ -40,6 +60,17 @@ films_add_response = api.model("Add Film Response", {
     "result": fields.Nested(film_response)
 })
 
+films_bulk_response = api.model("Bulk Add Films Response", {
+    "created": fields.Integer(example=2),
+    "failed": fields.Integer(example=1),
+    "result": fields.List(fields.Nested(api.model("Bulk Add Film Result", {
+        "index": fields.Integer(example=0, description="Position of film in request body"),
+        "id": fields.Integer(example=1, description="ID of created film"),
+        "message": fields.String(example="rating: Integer in range [1, 10]. Incorrect value.",
+                                 description="Why film has not been created")
+    })))
+})
+
 films_update_response = api.model("Update Film Response", {
     "message": fields.String(example="Film has been updated."),
     "result": fields.Nested(film_response)
@@ -0,0 +1,29 @@
+"""Restx monitoring models."""
+
+from flask_restx import fields
+
+from app import api
+
+cache_stats = api.model("Cache Stats", {
+    "size": fields.Integer(example=10),
+    "maxsize": fields.Integer(example=256),
+    "hits": fields.Integer(example=100),
+    "misses": fields.Integer(example=10)
+})
+
+caches_stats_response = api.model("Caches Stats Response", {
+    "*": fields.Wildcard(fields.Nested(cache_stats))
+})
+
+pool_stats_response = api.model("Pool Stats Response", {
+    "pool": fields.String(example="InstrumentedQueuePool"),
+    "size": fields.Integer(example=5),
+    "overflow": fields.Integer(example=-3, description="Overflow connections opened, negative until pool is full"),
+    "in_use": fields.Integer(example=2),
+    "max_in_use": fields.Integer(example=8),
+    "connections": fields.Integer(example=8, description="Connections opened"),
+    "checkouts": fields.Integer(example=1000),
+    "timeouts": fields.Integer(example=0),
+    "wait_time": fields.Float(example=0.5, description="Seconds spent in checkouts"),
+    "max_wait_time": fields.Float(example=0.01)
+})
@@ -0,0 +1,33 @@
+"""Module implements monitoring resources."""
+
+from flask_restx import Resource, Namespace
+
+from app import db
+from app.database.utils.pool import pool_stats
+from app.utils.cache import caches
+
+from app.resources.models.monitoring import caches_stats_response, pool_stats_response
+
+api = Namespace("monitoring", "Monitoring of process state")
+
+
+class CachesResource(Resource):
+    """Caches resource."""
+
+    @api.response(200, "Success", caches_stats_response)
+    def get(self):
+        """Returns sizes and hits and misses counts of in-process caches by cache name."""
+        return {name: cache.stats() for name, cache in caches.items()}
+
+
+class PoolResource(Resource):
+    """Database connections pool resource."""
+
+    @api.response(200, "Success", pool_stats_response)
+    def get(self):
+        """Returns size and usage counters of database connections pool of this process."""
+        return pool_stats(db.engine.pool)
+
+
+api.add_resource(CachesResource, "/caches")
+api.add_resource(PoolResource, "/pool")
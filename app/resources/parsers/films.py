@@ -1,16 +1,24 @@
 """Restx films parsers."""
 
-from flask_restx import reqparse
+from types import SimpleNamespace
+
+from flask_restx import reqparse, inputs
+from werkzeug.exceptions import HTTPException
+
+from app.schemas.films import FilmSchema
 
 from app.resources.utils.validators import sort_by_validator, sort_order_validator, date_validator, rating_validator, \
-    genres_ids_validator, genres_ids_list_validator, page_validator
+    genres_ids_validator, genres_ids_list_validator, page_validator, cursor_validator, \
+    films_fields_validator
 
 films_query_parser = reqparse.RequestParser()
 
-films_query_parser.add_argument("search", type=str, location="args")
-films_query_parser.add_argument("director_id", type=int, help="Should be specified as integer.", location="args")
-films_query_parser.add_argument("sort_by", type=sort_by_validator, help="Allowed values: premiere_date, rating.",
+films_query_parser.add_argument("search", type=str, help="Words that film title starts with.", location="args")
+films_query_parser.add_argument("search_in_description", type=inputs.boolean, help="Search also in description.",
                                 location="args")
+films_query_parser.add_argument("director_id", type=int, help="Should be specified as integer.", location="args")
+films_query_parser.add_argument("sort_by", type=sort_by_validator,
+                                help="Allowed values: premiere_date, rating, relevance.", location="args")
 films_query_parser.add_argument("sort_order", type=sort_order_validator, help="Allowed values: 1, -1.", location="args")
 films_query_parser.add_argument("start_premiere_date", type=date_validator, help="Should be specified in format: "
                                                                                  "YYYY-m-d.",
@@ -21,6 +29,17 @@ films_query_parser.add_argument("end_premiere_date", type=date_validator, help="
 films_query_parser.add_argument("rating", type=rating_validator, help="Integer in range [1, 10].", location="args")
 films_query_parser.add_argument("genres_ids", type=genres_ids_validator, help="IDs in format: 1,2,3.", location="args")
 films_query_parser.add_argument("page", type=page_validator, help="Integer more than 0.", location="args")
+films_query_parser.add_argument("fields", type=films_fields_validator,
+                                help="Film fields in format: title,rating. Allowed values: {}. id and sort_by field "
+                                     "are always included.".format(", ".join(FilmSchema.__fields__)),
+                                location="args")
+films_query_parser.add_argument("cursor", type=cursor_validator, help="Value of next_cursor from previous response.",
+                                location="args")
+
+films_facets_query_parser = films_query_parser.copy()
+
+for argument in ("sort_by", "sort_order", "page", "fields", "cursor"):
+    films_facets_query_parser.remove_argument(argument)
 
 films_add_body_parser = reqparse.RequestParser()
 films_add_body_parser.add_argument("title", required=True, type=str, help="Required string field.", location="json")
@@ -49,3 +68,22 @@ films_update_body_parser.add_argument("rating", required=True, help="Integer in
 films_update_body_parser.add_argument("poster_url", required=True, type=str, help="String field.", location="json")
 films_update_body_parser.add_argument("genres_ids", required=False, type=genres_ids_list_validator, help="List of IDs.",
                                       location="json")
+
+
+def parse_films_bulk_items(items: list) -> list:
+    """Parses each of items by films_add_body_parser, returns for each item parsed arguments or error message."""
+    parsed_items = []
+
+    for item in items:
+        if not isinstance(item, dict):
+            parsed_items.append("Film should be JSON object.")
+            continue
+
+        try:
+            parsed_items.append(films_add_body_parser.parse_args(req=SimpleNamespace(json=item)))
+
+        except HTTPException as err:
+            parsed_items.append(" ".join("{}: {}".format(name, message)
+                                         for name, message in err.data["errors"].items()))
+
+    return parsed_items
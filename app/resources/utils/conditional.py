@@ -0,0 +1,51 @@
+"""Conditional GET support for resources."""
+
+from datetime import timezone
+from functools import wraps
+
+from flask import request, Response
+from flask_restx.utils import unpack
+from werkzeug.http import http_date
+
+from app import db
+from app.database.utils.versions import get_table_versions
+
+
+def conditional(*tables):
+    """Adds ETag and Last-Modified made of tables change counters to successful responses.
+
+    Answers 304 Not Modified before calling the resource method when If-None-Match has the current ETag.
+    Last-Modified is informational only: HTTP dates are second-granular, so a write in the same second as a cached
+    response would not change it, and If-Modified-Since is ignored in favour of the change counters ETag.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            versions = get_table_versions(db.session, tables)
+
+            etag = "-".join(str(versions[table_name][0]) for table_name in tables)
+            last_modified = max((updated_at for _, updated_at in versions.values() if updated_at), default=None)
+
+            if last_modified:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.last_modified = last_modified
+
+                return response
+
+            data, code, headers = unpack(func(*args, **kwargs))
+
+            if code == 200:
+                headers = dict(headers or {}, ETag='"{}"'.format(etag))
+
+                if last_modified:
+                    headers["Last-Modified"] = http_date(last_modified)
+
+            return data, code, headers
+
+        return wrapper
+
+    return decorator
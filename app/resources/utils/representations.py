@@ -0,0 +1,45 @@
+"""Responses representations.
+
+JSON is encoded by orjson if it is installed, by stdlib json with RESTX_JSON settings otherwise.
+"""
+
+import json
+import datetime
+
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def json_default(value):
+    """Encodes values unknown to stdlib json."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+
+
+def dumps(data, indent: bool = False) -> bytes:
+    """Returns data encoded as JSON in utf-8 without escaping of non-ascii characters."""
+    if orjson:
+        return orjson.dumps(data, option=ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+
+    settings = dict(current_app.config.get("RESTX_JSON", {}))
+
+    if indent:
+        settings.setdefault("indent", 4)
+
+    return json.dumps(data, default=json_default, **settings).encode()
+
+
+def output_json(data, code, headers=None):
+    """Makes a response with JSON encoded body, indented in debug mode."""
+    response = make_response(dumps(data, indent=current_app.debug) + b"\n", code)
+    response.headers.extend(headers or {})
+
+    return response
@@ -0,0 +1,23 @@
+"""HTTP requests bodies."""
+
+import json
+
+from flask import request
+
+from app.resources.utils.responses import NDJSON_MIMETYPE
+
+
+def request_json_items() -> list:
+    """Returns items of JSON array body or of newline delimited json body, which is read line by line.
+
+    Raises ValueError if body is neither of them.
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        return [json.loads(line) for line in request.stream if line.strip()]
+
+    items = request.get_json(silent=True)
+
+    if not isinstance(items, list):
+        raise ValueError("Body should be JSON array or newline delimited JSON.")
+
+    return items
@@ -1,5 +1,11 @@
 """HTTP responses."""
 
+from flask import Response, stream_with_context
+
+from app.resources.utils.representations import dumps
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
 
 def successful_response_message(message, result=None):
     response = {"message": str(message)}
@@ -16,3 +22,12 @@ def bad_request_response_message(message):
 
 def not_found_request_response_message(message):
     return {"message": str(message)}, 404
+
+
+def ndjson_response(items):
+    """Streams dicts from items iterator as newline delimited json."""
+    def generate():
+        for item in items:
+            yield dumps(item) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -1,10 +1,11 @@
 """Data validators for parsers."""
 
-from app.utils.helpers import validate_date
+from app.utils.helpers import validate_date, decode_cursor
+from app.schemas.films import FilmSchema
 
 
 def sort_by_validator(value):
-    if value not in ["premiere_date", "rating"]:
+    if value not in ["premiere_date", "rating", "relevance"]:
         raise ValueError("Bad choice.")
 
     return value
@@ -62,6 +63,25 @@ def page_validator(value):
     return value
 
 
+def cursor_validator(value):
+    try:
+        decode_cursor(value)
+
+    except ValueError:
+        raise ValueError("Incorrect cursor.")
+
+    return value
+
+
+def films_fields_validator(value):
+    fields = value.split(",")
+
+    if not all(field in FilmSchema.__fields__ for field in fields):
+        raise ValueError("Bad choice.")
+
+    return value
+
+
 def genres_ids_list_validator(value):
     try:
         for id_ in value:
@@ -6,6 +6,7 @@ from enum import Enum, IntEnum
 class SortByEnum(str, Enum):
     BY_RATING = "rating"
     BY_PREMIERE_DATE = "premiere_date"
+    BY_RELEVANCE = "relevance"
 
 
 class SortOrderEnum(IntEnum):
@@ -1,6 +1,7 @@
 """Films pydantic schemas."""
 
-from typing import Optional
+from typing import Optional, Type
+from functools import lru_cache
 
 import datetime
 
@@ -38,8 +39,20 @@ class FilmSchema(BaseModel):
         return str(value)
 
 
+@lru_cache(maxsize=None)
+def film_fields_schema(fields: tuple[str, ...]) -> Type[FilmSchema]:
+    """Returns FilmSchema with only specified fields, other attributes are not touched by from_orm."""
+    class FilmFieldsSchema(FilmSchema):
+        pass
+
+    FilmFieldsSchema.__fields__ = {name: field for name, field in FilmSchema.__fields__.items() if name in fields}
+
+    return FilmFieldsSchema
+
+
 class FilmsQuerySchema(BaseModel):
     search: Optional[str]
+    search_in_description: Optional[bool]
     director_id: Optional[int]
     sort_by: Optional[SortByEnum]
     sort_order: Optional[SortOrderEnum]
@@ -48,6 +61,35 @@ class FilmsQuerySchema(BaseModel):
     rating: Optional[int]
     genres_ids: Optional[str]
     page: Optional[int]
+    cursor: Optional[str]
+    fields: Optional[str]
+
+    def fields_names(self) -> Optional[tuple[str, ...]]:
+        """Returns sorted requested film fields, id and sort field are always included."""
+        if not self.fields:
+            return None
+
+        fields = set(self.fields.split(",")) | {"id"}
+
+        if self.sort_by in ("rating", "premiere_date"):
+            fields.add(self.sort_by.value)
+
+        return tuple(sorted(fields))
+
+    def cache_key(self) -> tuple:
+        """Returns hashable canonical form of query, equal for queries selecting the same films."""
+        values = self.dict(exclude_none=True)
+
+        values.setdefault("sort_order", SortOrderEnum.ASC)
+        values.setdefault("page", 1)
+
+        if self.genres_ids:
+            values["genres_ids"] = tuple(sorted({int(genre_id) for genre_id in self.genres_ids.split(",")}))
+
+        if self.fields:
+            values["fields"] = self.fields_names()
+
+        return tuple(sorted(values.items()))
 
 
 class FilmBodySchema(BaseModel):
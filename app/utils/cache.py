@@ -0,0 +1,108 @@
+"""In-process caches."""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+# Named caches by name, for monitoring.
+caches = {}
+
+
+class Generation:
+    """Counter of data changes, cache entries stored under older value are stale."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """Marks data as changed."""
+        with self._lock:
+            self.value += 1
+
+
+class LRUCache:
+    """Size-bounded LRU cache which entries expire after ttl seconds or when generation is bumped.
+
+    Generation can also be passed to get and set, then entries are valid only for the generation they were set
+    with, which should be read before computing the value, so values computed during a change are not served after
+    it. Cache with maxsize 0 stores nothing. Named caches are registered in caches.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None, generation: Optional[Generation] = None,
+                 name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = generation
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if name:
+            caches[name] = self
+
+    def _current_generation(self):
+        return self.generation.value if self.generation else None
+
+    def get(self, key: Hashable, default: Any = None, generation: Optional[Hashable] = None) -> Any:
+        """Returns cached value or default if there is no fresh value for key."""
+        if generation is None:
+            generation = self._current_generation()
+
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, entry_generation, value = entry
+
+            if entry_generation != generation or (expires_at is not None and expires_at < time.monotonic()):
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[Hashable] = None):
+        """Stores value for key evicting the least recently used entries above maxsize."""
+        if self.maxsize <= 0:
+            return
+
+        if generation is None:
+            generation = self._current_generation()
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, generation, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Removes value for key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all values."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns cache size and hits and misses counts."""
+        return {"size": len(self), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return len(self._entries)
@@ -20,3 +20,6 @@ class UnauthorizedError(Exception):
 class GenreAlreadyExistsError(ValueError):
     pass
 
+
+class CursorError(ValueError):
+    pass
@@ -1,5 +1,8 @@
 """Helper functions."""
 
+import json
+import base64
+import binascii
 from datetime import datetime
 
 
@@ -11,3 +14,23 @@ def validate_date(date_str):
         return False
 
     return True
+
+
+def encode_cursor(values: list) -> str:
+    """Encodes list of json values into opaque url-safe cursor."""
+    dumped = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(dumped).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decodes cursor made by encode_cursor, raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Malformed cursor.")
+
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor.")
+
+    return values
@@ -12,6 +12,13 @@ def log_created_film(film: FilmSchema):
     app.logger.info(log_msg, film.id, film.title)
 
 
+def log_created_films(films_count: int):
+    log_msg = "Created films\n"
+    log_msg += "\tCount: %s"
+
+    app.logger.info(log_msg, films_count)
+
+
 def log_updated_film(film: FilmSchema):
     log_msg = "Updated film\n"
     log_msg += "\tID: %s\n"
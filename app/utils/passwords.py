@@ -0,0 +1,79 @@
+"""Passwords hashing.
+
+Hashing parameters are set by PASSWORD_HASH_METHOD and PASSWORD_SALT_LENGTH configs. With PASSWORD_HASH_WORKERS
+above 0 hashing runs in a process pool of that size, so CPU heavy logins don't hold the GIL of the worker
+serving other requests and can't take more than PASSWORD_HASH_WORKERS cores.
+
+The request still waits for its hash, so the pool helps only gthread and gevent workers, which serve other requests
+meanwhile. Sync workers get nothing but the overhead of passing work to the pool, which cut their logins
+throughput from 11.8 to 2.8 per second with one pool process in benchmarks/login_throughput.py, they should keep
+PASSWORD_HASH_WORKERS at 0.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+from app import app
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ProcessPoolExecutor:
+    """Returns process pool, created on first use, so every server worker process gets its own one.
+
+    Pool processes are started by forkserver, as forking a threaded server worker can copy locks held by its other
+    threads.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=app.config["PASSWORD_HASH_WORKERS"],
+                                            mp_context=multiprocessing.get_context("forkserver"))
+
+    return _executor
+
+
+def _run(func, *args):
+    if app.config["PASSWORD_HASH_WORKERS"] <= 0:
+        return func(*args)
+
+    return _pool().submit(func, *args).result()
+
+
+def _full_hash_method(method: str) -> str:
+    """Returns method as it is written in hashes, werkzeug adds default iterations to pbkdf2:<hash name>."""
+    name, *args = method.split(":")
+
+    if name != "pbkdf2" or not args:
+        return method
+
+    iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+
+    return "pbkdf2:{}:{}".format(args[0], iterations)
+
+
+def hash_password(password: str) -> str:
+    """Returns hash of password made with configured method and salt length."""
+    return _run(generate_password_hash, password, app.config["PASSWORD_HASH_METHOD"],
+                app.config["PASSWORD_SALT_LENGTH"])
+
+
+def check_password(password_hash: str, password: str) -> bool:
+    """Checks password against hash."""
+    return _run(check_password_hash, password_hash, password)
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """Returns True if hash was made with other method or salt length than configured ones."""
+    if password_hash.count("$") < 2:
+        return True
+
+    method, salt, _ = password_hash.split("$", 2)
+
+    return method != _full_hash_method(app.config["PASSWORD_HASH_METHOD"]) \
+        or len(salt) != app.config["PASSWORD_SALT_LENGTH"]
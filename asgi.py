@@ -0,0 +1 @@
+from app.asgi import application
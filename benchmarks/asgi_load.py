@@ -0,0 +1,147 @@
+"""Load benchmark of read-only endpoints served by gunicorn sync workers (wsgi.py) and by uvicorn (asgi.py).
+
+Both servers run WORKERS processes over the same seeded SQLite file with films cache disabled, CLIENTS concurrent
+keep-alive clients request films pages, films, genres and directors for DURATION seconds.
+Needs gunicorn, uvicorn and aiosqlite.
+
+Run from project root: python -m benchmarks.asgi_load
+"""
+
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+DATABASE_FILE = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///{}".format(DATABASE_FILE)
+os.environ["FILMS_CACHE_SIZE"] = "0"
+os.environ["APP_SETTINGS"] = "app.config.ProductionConfig"
+
+from app import app, db  # noqa: E402
+
+from tests.seeds import db_seed  # noqa: E402
+
+CLIENTS = 200
+DURATION = 10
+WORKERS = 3
+PORT = 5077
+
+SERVERS = {
+    "wsgi (gunicorn sync)": ["gunicorn", "-w", str(WORKERS), "-b", "127.0.0.1:{}".format(PORT), "--log-level",
+                             "warning", "wsgi:app"],
+    "asgi (uvicorn)": ["uvicorn", "--workers", str(WORKERS), "--port", str(PORT), "--log-level", "warning",
+                       "asgi:application"]
+}
+
+
+def random_path() -> str:
+    return random.choice([
+        "/films/?page={}".format(random.randint(1, 10)),
+        "/films/?sort_by=rating&sort_order=-1&genres_ids={}".format(random.randint(1, 20)),
+        "/films/{}".format(random.randint(1, 100)),
+        "/genres/",
+        "/directors/"
+    ])
+
+
+async def request(connection, path: str):
+    """Sends GET request over connection, returns status and whether server keeps connection open."""
+    reader, writer = connection
+    writer.write("GET {} HTTP/1.1\r\nHost: localhost\r\n\r\n".format(path).encode())
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in head[1:] if ": " in line)
+
+    await reader.readexactly(int(headers["content-length"]))
+
+    return int(head[0].split()[1]), headers.get("connection") != "close"
+
+
+async def client(deadline: float, latencies: list, errors: list):
+    connection = None
+
+    while time.monotonic() < deadline:
+        start = time.monotonic()
+
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", PORT)
+
+            status, keep_alive = await request(connection, random_path())
+
+            if status != 200:
+                errors.append(status)
+
+            if not keep_alive:
+                connection[1].close()
+                connection = None
+
+        except (OSError, asyncio.IncompleteReadError) as err:
+            errors.append(type(err).__name__)
+            connection = None
+
+        latencies.append(time.monotonic() - start)
+
+    if connection:
+        connection[1].close()
+
+
+async def load() -> tuple[list, list]:
+    latencies, errors = [], []
+    deadline = time.monotonic() + DURATION
+
+    await asyncio.gather(*(client(deadline, latencies, errors) for _ in range(CLIENTS)))
+
+    return latencies, errors
+
+
+def wait_for_server(timeout: float = 20):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", PORT), 1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError("Server didn't start.")
+
+
+def measure(name: str, command: list[str]):
+    server = subprocess.Popen(command, env=os.environ.copy(), stdout=subprocess.DEVNULL)
+
+    try:
+        wait_for_server()
+        latencies, errors = asyncio.run(load())
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+
+    print("{}: {:.0f} requests/s, p50 {:.1f} ms, p99 {:.1f} ms, {} errors".format(
+        name, len(latencies) / DURATION, latencies[len(latencies) // 2] * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000, len(errors)
+    ))
+
+
+def main():
+    with app.app_context():
+        db.create_all()
+
+    db_seed()
+
+    print("{} clients, {} workers, {} s".format(CLIENTS, WORKERS, DURATION))
+
+    for name, command in SERVERS.items():
+        measure(name, command)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
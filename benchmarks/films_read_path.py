@@ -0,0 +1,285 @@
+"""Benchmark of films read path at scale: FilmsCRUD.read, single films, FilmSchema serialization and HTTP requests.
+
+Films are seeded deterministically (same SEED gives the same films) into SQLite file in temp directory, which is
+reused by later runs with the same films count. Another database can be set with SQLALCHEMY_DATABASE_URI, it
+should be empty or seeded by this benchmark before. Films cache is disabled.
+
+FilmsCRUD.read is timed with no filters, each filter alone and all filters together, each of them with every sort,
+--all-combinations times every combination of filters instead. Results (seconds per call) are written as JSON
+to --output, with --baseline they are compared to results saved before and the run fails if any case is
+slower than baseline by more than --threshold.
+
+Run from project root: python -m benchmarks.films_read_path --films 100000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from datetime import date, timedelta
+from itertools import combinations, cycle
+from typing import Any, Callable, Optional
+
+FILMS_COUNTS = (10_000, 100_000, 1_000_000)
+SEED = 20_221
+GENRES = 20
+DIRECTORS = 200
+SEED_CHUNK_SIZE = 10_000
+REPEATS = 5
+SINGLE_FILMS = 100
+SERIALIZED_FILMS = 100
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Films read path benchmark.")
+    parser.add_argument("--films", type=int, choices=FILMS_COUNTS, default=FILMS_COUNTS[0])
+    parser.add_argument("--all-combinations", action="store_true", help="time every combination of filters")
+    parser.add_argument("--output", help="path of JSON results file")
+    parser.add_argument("--baseline", help="path of JSON results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 is 20%%")
+
+    return parser.parse_args()
+
+
+args = parse_args() if __name__ == "__main__" else None
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite:///{}".format(
+    os.path.join(tempfile.gettempdir(), "films_read_path_{}.db".format(args.films if args else FILMS_COUNTS[0]))
+))
+os.environ["FILMS_CACHE_SIZE"] = "0"
+os.environ["APP_SETTINGS"] = "app.config.ProductionConfig"
+
+from faker import Faker  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from app import app, db  # noqa: E402
+from app.database.cruds.films import FilmsCRUD  # noqa: E402
+from app.database.models import Film, Genre, Director, User, Role, film_genres  # noqa: E402
+from app.schemas.films import FilmsQuerySchema, FilmSchema  # noqa: E402
+
+faker_ = Faker()
+faker_.seed_instance(SEED)
+
+WORDS = sorted(set(faker_.words(500)))
+
+FILTERS = {
+    "search": {"search": WORDS[0]},
+    "search_in_description": {"search": WORDS[1], "search_in_description": True},
+    "director": {"director_id": 1},
+    "rating": {"rating": 7},
+    "premiere_dates": {"start_premiere_date": "2010-01-01", "end_premiere_date": "2012-12-31"},
+    "genres": {"genres_ids": "1,2"}
+}
+
+SORTS = {
+    "id": {},
+    "rating_asc": {"sort_by": "rating", "sort_order": 1},
+    "rating_desc": {"sort_by": "rating", "sort_order": -1},
+    "premiere_date_asc": {"sort_by": "premiere_date", "sort_order": 1},
+    "premiere_date_desc": {"sort_by": "premiere_date", "sort_order": -1},
+    "relevance": {"sort_by": "relevance"}
+}
+
+URLS = (
+    "/films/",
+    "/films/?page=100",
+    "/films/?sort_by=rating&sort_order=-1&genres_ids=1,2",
+    "/films/?search={}&sort_by=relevance".format(WORDS[0]),
+    "/films/?fields=id,title&sort_by=premiere_date",
+    "/films/facets?rating=7",
+    "/films/1"
+)
+
+
+def seed_films(films_count: int):
+    """Seeds films_count films with genres and directors, the same for the same SEED."""
+    rng = random.Random(SEED)
+    names = Faker()
+    names.seed_instance(SEED)
+
+    db.session.add_all([Role(id=1, name="admin"), Role(id=2, name="user")])
+    db.session.add_all([User(id=1, username="admin", password=generate_password_hash("123"), role_id=1),
+                        User(id=2, username="just_a_user", password=generate_password_hash("123"), role_id=2)])
+    db.session.add_all([Genre(id=id_, name="Genre {}".format(id_)) for id_ in range(1, GENRES + 1)])
+    db.session.add_all([Director(id=id_, first_name=names.first_name(), last_name=names.last_name())
+                        for id_ in range(1, DIRECTORS + 1)])
+    db.session.commit()
+
+    first_premiere_date, premiere_days = date(2005, 1, 1), (date(2022, 1, 1) - date(2005, 1, 1)).days
+
+    for chunk_start in range(1, films_count + 1, SEED_CHUNK_SIZE):
+        films, genres = [], []
+
+        for id_ in range(chunk_start, min(chunk_start + SEED_CHUNK_SIZE, films_count + 1)):
+            films.append({
+                "id": id_,
+                "title": " ".join(rng.choices(WORDS, k=3)).capitalize(),
+                "premiere_date": first_premiere_date + timedelta(days=rng.randrange(premiere_days)),
+                "description": " ".join(rng.choices(WORDS, k=20)).capitalize() + ".",
+                "rating": rng.randrange(1, 11),
+                "poster_url": "https://example.com/image",
+                "director_id": rng.randrange(1, DIRECTORS + 1),
+                "user_id": id_ % 2 + 1
+            })
+            genres.extend({"film_id": id_, "genre_id": genre_id}
+                          for genre_id in rng.sample(range(1, GENRES + 1), rng.randrange(1, 5)))
+
+        db.session.execute(insert(Film.__table__), films)
+        db.session.execute(insert(film_genres), genres)
+        db.session.commit()
+
+        print("seeded {} films".format(chunk_start + len(films) - 1), file=sys.stderr)
+
+
+def prepare_database(films_count: int):
+    """Creates and seeds database, seeded database is reused if it has films_count films."""
+    db.create_all()
+
+    seeded_films = db.session.scalar(select(func.count(Film.id)))
+
+    if seeded_films == films_count:
+        return
+
+    if seeded_films:
+        raise SystemExit("Database has {} films instead of {}, set SQLALCHEMY_DATABASE_URI to an empty "
+                         "database.".format(seeded_films, films_count))
+
+    seed_films(films_count)
+
+
+def time_call(function: Callable[[], Any]) -> dict[str, float]:
+    """Returns min and median seconds per call of function, repeated to run at least 0.2 s each time."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat=REPEATS, number=number)]
+
+    return {"min": min(times), "median": statistics.median(times)}
+
+
+def merge_filters(names: tuple[str, ...]) -> dict[str, Any]:
+    """Returns query parameters of all named filters."""
+    query = {}
+
+    for name in names:
+        query |= FILTERS[name]
+
+    return query
+
+
+def filters_combinations(all_combinations: bool) -> dict[str, dict[str, Any]]:
+    """Returns filters combinations by names, search filters are not combined with each other."""
+    if all_combinations:
+        names = [names for size in range(len(FILTERS) + 1) for names in combinations(FILTERS, size)
+                 if not {"search", "search_in_description"} <= set(names)]
+    else:
+        names = [()] + [(name,) for name in FILTERS] + [tuple(name for name in FILTERS if name != "search")]
+
+    return {"+".join(combination) or "no_filters": merge_filters(combination) for combination in names}
+
+
+def crud_read_cases(all_combinations: bool) -> dict[str, dict[str, Any]]:
+    """Returns FilmsCRUD.read queries by case names, relevance sort is used only with search."""
+    return {
+        "read/{}/{}".format(filters_name, sort_name): filters | sort
+        for filters_name, filters in filters_combinations(all_combinations).items()
+        for sort_name, sort in SORTS.items()
+        if sort_name != "relevance" or "search" in filters
+    }
+
+
+def run(films_count: int, all_combinations: bool) -> dict[str, Any]:
+    """Runs all cases and returns results with run environment."""
+    results = {}
+
+    def measure(name: str, function: Callable[[], Any]):
+        results[name] = time_call(function)
+        print("{}: {:.3f} ms".format(name, results[name]["min"] * 1000), file=sys.stderr)
+
+    with app.app_context():
+        prepare_database(films_count)
+
+        crud = FilmsCRUD()
+
+        for name, query in crud_read_cases(all_combinations).items():
+            data = FilmsQuerySchema.parse_obj(query)
+            measure(name, lambda: crud.read(data))
+
+        films_ids = cycle(random.Random(SEED).sample(range(1, films_count + 1), SINGLE_FILMS))
+        measure("read_one", lambda: crud.read_one(next(films_ids)))
+
+        films = crud._query().order_by(Film.id).limit(SERIALIZED_FILMS).all()
+        measure("serialize/FilmSchema", lambda: [FilmSchema.from_orm(film).dict() for film in films])
+
+        db.session.remove()
+
+    client = app.test_client()
+
+    for url in URLS:
+        assert client.get(url).status_code == 200, url
+        measure("http/GET {}".format(url), lambda: client.get(url))
+
+    return {
+        "films": films_count,
+        "database": db.engine.dialect.name,
+        "python": platform.python_version(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Prints cases min times against baseline, returns names of cases slower than baseline by over threshold."""
+    if baseline["films"] != results["films"]:
+        raise SystemExit("Baseline is measured on {} films, not {}.".format(baseline["films"], results["films"]))
+
+    regressions = []
+
+    for name, timing in results["results"].items():
+        baseline_timing: Optional[dict[str, float]] = baseline["results"].get(name)
+
+        if baseline_timing is None:
+            print("{}: {:.3f} ms, not in baseline".format(name, timing["min"] * 1000))
+            continue
+
+        change = timing["min"] / baseline_timing["min"] - 1
+
+        if change > threshold:
+            regressions.append(name)
+
+        print("{}: {:.3f} ms, baseline {:.3f} ms, {:+.1f}%{}".format(
+            name, timing["min"] * 1000, baseline_timing["min"] * 1000, change * 100,
+            " REGRESSION" if change > threshold else ""
+        ))
+
+    return regressions
+
+
+def main():
+    app.logger.disabled = True
+
+    results = run(args.films, args.all_combinations)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+        if regressions:
+            print("{} cases are slower than baseline by more than {:.0%}.".format(len(regressions), args.threshold))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
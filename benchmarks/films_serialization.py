@@ -0,0 +1,53 @@
+"""Benchmark of films list serialization: pydantic FilmSchema.from_orm against core rows serializer.
+
+Run from project root: python -m benchmarks.films_serialization
+"""
+
+import os
+import timeit
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+
+from app import app, db  # noqa: E402
+from app.database.cruds.films import FilmsCRUD  # noqa: E402
+from app.schemas.films import FilmsQuerySchema  # noqa: E402
+
+from tests.seeds import db_seed  # noqa: E402
+
+REPEATS = 5
+NUMBER = 20
+
+QUERIES = {
+    "page of 100 films": {"page": 1},
+    "all films": {"page": -1}
+}
+
+
+def main():
+    app.logger.disabled = True
+    app.config["FILMS_PER_PAGE"] = 100
+
+    with app.app_context():
+        db.create_all()
+        db_seed()
+
+        crud = FilmsCRUD()
+
+        for name, query in QUERIES.items():
+            data = FilmsQuerySchema.parse_obj(query)
+
+            assert crud.read_dicts(data) == [film.dict() for film in crud.read(data)]
+
+            number = NUMBER if data.page != -1 else 1
+
+            schema_time = min(timeit.repeat(lambda: [film.dict() for film in crud.read(data)],
+                                            repeat=REPEATS, number=number)) / number
+            rows_time = min(timeit.repeat(lambda: crud.read_dicts(data), repeat=REPEATS, number=number)) / number
+
+            print("{}: from_orm {:.2f} ms, rows serializer {:.2f} ms, speedup x{:.1f}".format(
+                name, schema_time * 1000, rows_time * 1000, schema_time / rows_time
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark of JSON encoders of responses on 1000 films payload: orjson against stdlib json.
+
+Run from project root: python -m benchmarks.json_encoders
+"""
+
+import os
+import timeit
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+
+from app import app, db  # noqa: E402
+from app.database.cruds.films import FilmsCRUD  # noqa: E402
+from app.schemas.films import FilmsQuerySchema  # noqa: E402
+from app.resources.utils import representations  # noqa: E402
+
+from tests.seeds import db_seed  # noqa: E402
+
+REPEATS = 5
+NUMBER = 20
+
+
+def main():
+    app.logger.disabled = True
+
+    if representations.orjson is None:
+        raise SystemExit("orjson is not installed.")
+
+    with app.app_context():
+        db.create_all()
+        db_seed()
+
+        films = FilmsCRUD().read_dicts(FilmsQuerySchema.parse_obj({"page": -1}))[:1000]
+        payload = {"count": len(films), "result": films, "next_cursor": None}
+
+        orjson_time = min(timeit.repeat(lambda: representations.dumps(payload), repeat=REPEATS, number=NUMBER))
+
+        orjson = representations.orjson
+        representations.orjson = None
+
+        try:
+            json_time = min(timeit.repeat(lambda: representations.dumps(payload), repeat=REPEATS, number=NUMBER))
+        finally:
+            representations.orjson = orjson
+
+        print("{} films: json {:.2f} ms, orjson {:.2f} ms, speedup x{:.1f}".format(
+            len(films), json_time / NUMBER * 1000, orjson_time / NUMBER * 1000, json_time / orjson_time
+        ))
+
+
+if __name__ == "__main__":
+    main()
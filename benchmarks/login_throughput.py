@@ -0,0 +1,76 @@
+"""Benchmark of logins throughput and of concurrent reads throughput with passwords hashed inline and in a pool.
+
+Run from project root: python -m benchmarks.login_throughput
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+DATABASE_FILE = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///{}".format(DATABASE_FILE)
+
+from app import app, db  # noqa: E402
+from app.utils import passwords  # noqa: E402
+
+from tests.seeds import db_seed  # noqa: E402
+
+DURATION = 5
+LOGIN_THREADS = 8
+READ_THREADS = 4
+
+
+def run_for(duration, request):
+    """Calls request until duration passes, returns number of calls."""
+    client = app.test_client()
+    deadline = time.monotonic() + duration
+    count = 0
+
+    while time.monotonic() < deadline:
+        request(client)
+        count += 1
+
+    return count
+
+
+def login(client):
+    assert client.post("/auth/login", json={"username": "just_a_user", "password": "123"}).status_code == 200
+
+
+def read(client):
+    assert client.get("/genres/").status_code == 200
+
+
+def measure(workers):
+    app.config["PASSWORD_HASH_WORKERS"] = workers
+    passwords._executor = None
+
+    logins, reads = [], []
+    threads = [threading.Thread(target=lambda: logins.append(run_for(DURATION, login))) for _ in range(LOGIN_THREADS)]
+    threads += [threading.Thread(target=lambda: reads.append(run_for(DURATION, read))) for _ in range(READ_THREADS)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    print("hash workers {}: {:.1f} logins/s, {:.1f} concurrent reads/s".format(
+        workers, sum(logins) / DURATION, sum(reads) / DURATION
+    ))
+
+
+def main():
+    app.logger.disabled = True
+
+    with app.app_context():
+        db.create_all()
+        db_seed()
+
+    for workers in (0, os.cpu_count() or 1):
+        measure(workers)
+
+
+if __name__ == "__main__":
+    main()
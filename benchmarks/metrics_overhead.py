@@ -0,0 +1,69 @@
+"""Benchmark of requests metrics overhead: requests latency with METRICS_ENABLED off and on.
+
+Metrics are measured in-process and in multiprocess mode (PROMETHEUS_MULTIPROC_DIR set), which gunicorn workers
+use and which keeps values in memory mapped files. Each mode runs in its own process, as prometheus_client picks
+values storage on import. Needs prometheus_client.
+
+Run from project root: python -m benchmarks.metrics_overhead
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", "sqlite://")
+
+REPEATS = 5
+NUMBER = 500
+URLS = ("/genres/", "/films/1", "/monitoring/caches")
+
+
+def measure(mode: str):
+    from app import app, db
+    from app import metrics
+
+    from tests.seeds import db_seed
+
+    if metrics.prometheus_client is None:
+        raise SystemExit("prometheus_client is not installed.")
+
+    app.logger.disabled = True
+
+    with app.app_context():
+        db.create_all()
+
+    db_seed()
+
+    client = app.test_client()
+
+    for url in URLS:
+        times = {}
+
+        for enabled in (False, True):
+            app.config["METRICS_ENABLED"] = enabled
+            times[enabled] = min(timeit.repeat(lambda: client.get(url), repeat=REPEATS, number=NUMBER)) / NUMBER
+
+        print("{} {}: {:.0f} us without metrics, {:.0f} us with metrics, overhead {:.0f} us ({:.1f}%)".format(
+            mode, url, times[False] * 1e6, times[True] * 1e6, (times[True] - times[False]) * 1e6,
+            (times[True] / times[False] - 1) * 100
+        ))
+
+
+def main():
+    if len(sys.argv) > 1:
+        return measure(sys.argv[1])
+
+    env = {key: value for key, value in os.environ.items() if key != "PROMETHEUS_MULTIPROC_DIR"}
+    subprocess.run([sys.executable, "-m", "benchmarks.metrics_overhead", "in-process"], env=env, check=True)
+
+    with tempfile.TemporaryDirectory() as multiprocess_dir:
+        subprocess.run([sys.executable, "-m", "benchmarks.metrics_overhead", "multiprocess"],
+                       env=dict(env, PROMETHEUS_MULTIPROC_DIR=multiprocess_dir), check=True)
+
+    return None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
 #!/bin/sh
 flask db migrate
 flask db upgrade
-gunicorn --bind 0.0.0.0:5000 -w 3 wsgi:app
\ No newline at end of file
+gunicorn -c gunicorn.conf.py wsgi:app
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""Gunicorn config driven by environment.
+
+Default is 3 sync workers. GUNICORN_WORKER_CLASS=gthread with GUNICORN_THREADS or GUNICORN_WORKER_CLASS=gevent
+with GUNICORN_WORKER_CONNECTIONS let a worker serve other requests while one waits for the database, gevent
+needs gevent installed and psycogreen for cooperative psycopg2. db.session is scoped to the current greenlet
+(thread in gthread workers) and removed after each request, so concurrent requests of a worker never share it.
+
+With PROMETHEUS_MULTIPROC_DIR set, metrics files of previous runs are removed on start and exited workers are
+marked dead, so /metrics aggregates live workers gauges.
+
+Run from project root: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+import glob
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 3))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.getenv("GUNICORN_THREADS", 1))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+preload_app = bool(int(os.getenv("GUNICORN_PRELOAD", 0)))
+
+
+def post_fork(server, worker):
+    """Makes worker open its own database connections and makes psycopg2 cooperative in gevent workers."""
+    if worker_class == "gevent":
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning("psycogreen is not installed, psycopg2 queries block gevent workers.")
+
+    if preload_app:
+        from app import app, db
+
+        # Connections opened by master are left to it, closing them would break them for other workers.
+        db.dispose_engines(app, close=False)
+
+
+def on_starting(server):
+    """Removes metrics files left by previous run."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        for path in glob.glob(os.path.join(os.getenv("PROMETHEUS_MULTIPROC_DIR"), "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,78 @@
+"""films full text search
+
+Revision ID: 52abb227d214
+Revises: 4ffeaf46bc50
+Create Date: 2026-10-18 10:12:41.518302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '52abb227d214'
+down_revision = '4ffeaf46bc50'
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({table}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({table}description, '')), 'B')"
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE films ADD COLUMN search_vector tsvector")
+        op.execute(
+            "CREATE FUNCTION films_search_vector_update() RETURNS trigger AS $$ "
+            "BEGIN NEW.search_vector := {}; RETURN NEW; END "
+            "$$ LANGUAGE plpgsql".format(POSTGRES_SEARCH_VECTOR.format(table="NEW."))
+        )
+        op.execute(
+            "CREATE TRIGGER films_search_vector_trigger BEFORE INSERT OR UPDATE OF title, description ON films "
+            "FOR EACH ROW EXECUTE FUNCTION films_search_vector_update()"
+        )
+        op.execute("UPDATE films SET search_vector = {}".format(POSTGRES_SEARCH_VECTOR.format(table="")))
+        op.execute("CREATE INDEX ix_films_search_vector ON films USING GIN (search_vector)")
+
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE films_fts USING fts5(title, description, content='films', content_rowid='id', "
+            "prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER films_fts_insert AFTER INSERT ON films BEGIN "
+            "INSERT INTO films_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER films_fts_delete AFTER DELETE ON films BEGIN "
+            "INSERT INTO films_fts(films_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER films_fts_update AFTER UPDATE OF title, description ON films BEGIN "
+            "INSERT INTO films_fts(films_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO films_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute("INSERT INTO films_fts(films_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX ix_films_search_vector")
+        op.execute("DROP TRIGGER films_search_vector_trigger ON films")
+        op.execute("DROP FUNCTION films_search_vector_update()")
+        op.execute("ALTER TABLE films DROP COLUMN search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER films_fts_update")
+        op.execute("DROP TRIGGER films_fts_delete")
+        op.execute("DROP TRIGGER films_fts_insert")
+        op.execute("DROP TABLE films_fts")
@@ -1,7 +1,10 @@
 """Config module for tests."""
 
+from contextlib import contextmanager
+
 import pytest
 from faker import Faker
+from sqlalchemy import event
 
 from app import app, db
 from app.database.cruds.films import FilmsCRUD
@@ -46,6 +49,43 @@ def directors_crud():
     return DirectorsCRUD()
 
 
+@pytest.fixture
+def count_queries():
+    """Returns context manager that collects executed sql statements into list."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counter
+
+
+@pytest.fixture
+def query_budget(count_queries):
+    """Returns context manager that fails test if more than max_queries sql statements are executed in it."""
+    @contextmanager
+    def budget(max_queries: int):
+        with count_queries() as statements:
+            yield statements
+
+        assert len(statements) <= max_queries, "{} queries over budget of {}:\n{}".format(
+            len(statements), max_queries, "\n".join(statements)
+        )
+
+    return budget
+
+
 @pytest.fixture
 def client():
     return app.test_client()
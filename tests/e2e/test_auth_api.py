@@ -1,6 +1,9 @@
 import pytest
 from pydantic import ValidationError
 
+from app import app, db
+from app.auth import users_identities
+from app.database.models import User
 from app.schemas.users import UserWithRoleSchema
 
 
@@ -98,3 +101,73 @@ def test_user_info_with_no_logged(not_logged_client):
 
     assert resp.status_code == 401
     assert resp.json == {"message": "Unauthenticated."}
+
+
+def test_user_identity_cached(logged_client, count_queries):
+    client = logged_client
+
+    client.get("/auth/user")
+
+    with count_queries() as statements:
+        resp = client.get("/auth/user")
+
+    assert resp.status_code == 200
+    assert not [statement for statement in statements if "FROM users" in statement]
+
+    stats = client.get("/monitoring/caches").json["users"]
+
+    assert stats["hits"] > 0
+    assert stats["misses"] > 0
+
+
+def test_user_identity_invalidated(not_logged_client, faker):
+    client = not_logged_client
+
+    credentials = {"username": faker.pystr(), "password": "123"}
+
+    client.post("/auth/register", json=credentials)
+    client.post("/auth/login", json=credentials)
+
+    user_id = client.get("/auth/user").json["id"]
+
+    db.session.get(User, user_id).username = "renamed_{}".format(user_id)
+    db.session.commit()
+
+    assert client.get("/auth/user").json["username"] == "renamed_{}".format(user_id)
+
+
+def test_user_identity_invalidated_after_commit(logged_admin):
+    client = logged_admin
+    admin_id = client.get("/auth/user").json["id"]
+
+    db.session.get(User, admin_id).role_id = 2
+    db.session.flush()
+
+    # demotion is not committed yet and may be rolled back
+    assert users_identities.get(admin_id).is_admin()
+
+    db.session.rollback()
+
+    assert client.get("/auth/user").json["role"]["name"] == "admin"
+
+    db.session.get(User, admin_id).role_id = 2
+    db.session.commit()
+
+    try:
+        assert client.get("/auth/user").json["role"]["name"] == "user"
+    finally:
+        db.session.get(User, admin_id).role_id = 1
+        db.session.commit()
+
+
+def test_user_login_rehashes_password(not_logged_client, monkeypatch, faker):
+    client = not_logged_client
+
+    credentials = {"username": faker.pystr(), "password": "123"}
+    client.post("/auth/register", json=credentials)
+
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+
+    assert client.post("/auth/login", json=credentials).status_code == 200
+    assert User.query.filter_by(username=credentials["username"]).first().password.startswith("pbkdf2:sha256:1000$")
+    assert client.post("/auth/login", json=credentials).status_code == 200
@@ -11,6 +11,18 @@ def test_get_directors(client):
     assert set(resp.json.keys()) == {"count", "result"}
 
 
+def test_get_directors_not_modified(logged_admin):
+    client = logged_admin
+
+    etag = client.get("/directors/").headers["ETag"]
+
+    assert client.get("/directors/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/directors/", json=generate_director_data())
+
+    assert client.get("/directors/", headers={"If-None-Match": etag}).status_code == 200
+
+
 def test_add_director(logged_admin):
     client = logged_admin
 
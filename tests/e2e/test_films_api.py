@@ -1,4 +1,6 @@
+import json
 import random
+from collections import Counter
 from urllib.parse import urlencode
 from datetime import datetime
 
@@ -8,13 +10,17 @@ from tests.e2e.utils import generate_film_data
 
 from app import app, db
 from app.database.models import Film, User
+from app.database.cruds.films import FilmsCRUD
+from app.database.utils.versions import bump_table_versions
+from app.domain.films import get_all_films
+from app.schemas.films import FilmsQuerySchema
 
 
 def test_get_films(client):
     resp = client.get("/films/")
 
     assert resp.status_code == 200
-    assert set(resp.json.keys()) == {"count", "result"}
+    assert set(resp.json.keys()) == {"count", "result", "next_cursor"}
 
 
 def test_get_films_with_params(client, faker):
@@ -66,6 +72,74 @@ def test_get_films_with_params(client, faker):
             page += 1
 
 
+@pytest.mark.parametrize("sort_by, sort_order", [
+    (None, 1),
+    (None, -1),
+    ("rating", 1),
+    ("rating", -1),
+    ("premiere_date", 1),
+    ("premiere_date", -1)
+])
+def test_get_films_by_cursor(client, sort_by, sort_order):
+    director_id = client.get("/directors/").json["result"][0]["id"]
+
+    params = {"director_id": director_id, "sort_order": sort_order}
+    if sort_by:
+        params["sort_by"] = sort_by
+
+    paged_films_ids = []
+    page = 1
+    while True:
+        films_resp = client.get("/films/?{}".format(urlencode(params | {"page": page}))).json
+
+        if films_resp["count"] == 0:
+            break
+
+        paged_films_ids.extend(film["id"] for film in films_resp["result"])
+        page += 1
+
+    films_ids = []
+    films_resp = client.get("/films/?{}".format(urlencode(params))).json
+    while True:
+        films_ids.extend(film["id"] for film in films_resp["result"])
+
+        if not films_resp["next_cursor"]:
+            break
+
+        films_resp = client.get("/films/?{}".format(urlencode(params | {"cursor": films_resp["next_cursor"]}))).json
+
+    assert films_ids == paged_films_ids
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"sort_by": "rating", "sort_order": -1},
+    {"rating": 7, "sort_by": "premiere_date", "page": 2}
+])
+def test_get_films_ndjson(client, params):
+    resp = client.get("/films/?{}".format(urlencode(params)), headers={"Accept": "application/x-ndjson"})
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+
+    films = [json.loads(line) for line in resp.data.decode().splitlines()]
+    expected_films = get_all_films(FilmsCRUD(), FilmsQuerySchema.parse_obj(params | {"page": -1}))
+
+    assert films == [film.dict() for film in expected_films]
+
+
+@pytest.mark.parametrize("params, expected_keys", [
+    ({"fields": "title,rating"}, {"id", "title", "rating"}),
+    ({"fields": "genres", "sort_by": "premiere_date"}, {"id", "genres", "premiere_date"})
+])
+def test_get_films_with_fields(client, params, expected_keys):
+    resp = client.get("/films/?{}".format(urlencode(params)))
+
+    assert resp.status_code == 200
+    assert all(film.keys() == expected_keys for film in resp.json["result"])
+    assert resp.json["next_cursor"]
+
+
 @pytest.mark.parametrize("params", [
     "director_id=something",
     "sort_by=something",
@@ -79,12 +153,102 @@ def test_get_films_with_params(client, faker):
     "rating=0",
     "rating=11",
     "genres_ids=asd",
-    "genres_ids=a,b,c"
+    "genres_ids=a,b,c",
+    "cursor=something",
+    "fields=password",
+    "fields=title,",
+    "cursor=WyJpZCIsMTAsMTBd&sort_by=rating",
+    "cursor=WyJpZCIsMWU0MDAsMV0",
+    "cursor=WyJpZCIsMTAwMDAwMDAwMDAwMDAwMDAwMDAwMDAwMDAwMDAwMCwxXQ",
+    "cursor=WyJyYXRpbmciLDcsMWU0MDBd&sort_by=rating"
 ])
 def test_get_films_with_bad_params(client, params):
     assert client.get("/films/?{}".format(params)).status_code == 400
 
 
+@pytest.mark.parametrize("params", [
+    {},
+    {"rating": 7},
+    {"genres_ids": "1,2", "start_premiere_date": "2010-01-01"},
+    {"search": "a", "director_id": 3}
+])
+def test_get_films_facets(client, count_queries, params):
+    with count_queries() as statements:
+        resp = client.get("/films/facets?{}".format(urlencode(params)))
+
+    assert resp.status_code == 200
+    # films change counter, the cache is keyed on, and facets union query
+    assert len(statements) == 2
+
+    films = get_all_films(FilmsCRUD(), FilmsQuerySchema.parse_obj(params | {"page": -1}))
+
+    facets = {facet: {item[key]: item["count"] for item in resp.json[facet]}
+              for facet, key in {"genres": "id", "directors": "id", "ratings": "rating", "years": "year"}.items()}
+
+    assert facets["genres"] == Counter(genre.id for film in films for genre in film.genres)
+    assert facets["directors"] == Counter(film.director.id if film.director != "unknown" else None for film in films)
+    assert facets["ratings"] == Counter(film.rating for film in films)
+    assert facets["years"] == Counter(int(film.premiere_date[:4]) for film in films)
+
+
+def test_get_films_facets_after_add(logged_client):
+    client = logged_client
+
+    film_data = generate_film_data(client)
+    params = urlencode({"director_id": film_data["director_id"]})
+
+    count = sum(item["count"] for item in client.get("/films/facets?{}".format(params)).json["ratings"])
+    client.post("/films/", json=film_data)
+
+    assert sum(item["count"] for item in client.get("/films/facets?{}".format(params)).json["ratings"]) == count + 1
+
+
+def test_get_films_after_write_of_another_process(client):
+    url = "/films/?sort_by=premiere_date&sort_order=-1"
+    client.get(url)
+
+    # another worker commits without touching this process cache
+    film = Film(title="Film of another worker", premiere_date=datetime(2040, 1, 1), rating=5,
+                poster_url="https://example.com/image", user_id=1)
+    db.session.add(film)
+    bump_table_versions(db.session, ("films",))
+    db.session.commit()
+    film_id = film.id
+
+    try:
+        assert client.get(url).json["result"][0]["id"] == film_id
+    finally:
+        Film.query.filter_by(id=film_id).delete()
+        bump_table_versions(db.session, ("films",))
+        db.session.commit()
+
+
+@pytest.mark.parametrize("params", [
+    "rating=11",
+    "genres_ids=a,b",
+    "start_premiere_date=something"
+])
+def test_get_films_facets_with_bad_params(client, params):
+    assert client.get("/films/facets?{}".format(params)).status_code == 400
+
+
+def test_get_films_by_genres_ids_out_of_integers_range(client):
+    resp = client.get("/films/?genres_ids=99999999999999999999")
+
+    assert resp.status_code == 200
+    assert resp.json["count"] == 0
+
+    resp = client.get("/films/?genres_ids=1,-99999999999999999999")
+
+    assert resp.status_code == 200
+    assert resp.json["count"] == client.get("/films/?genres_ids=1").json["count"]
+
+    resp = client.get("/films/facets?genres_ids=99999999999999999999")
+
+    assert resp.status_code == 200
+    assert resp.json["ratings"] == []
+
+
 def test_add_film(logged_client):
     client = logged_client
 
@@ -115,6 +279,69 @@ def test_add_film(logged_client):
         assert set([genre.id for genre in film.genres]) == set(film_data["genres_ids"])
 
 
+def test_add_films_bulk(logged_client, count_queries, monkeypatch):
+    client = logged_client
+
+    films_data = [generate_film_data(client) for _ in range(5)]
+    films_data[1]["rating"] = 11
+    films_data[2]["director_id"] = 100000
+    films_data[3]["genres_ids"] = [1, 100000, 100001]
+
+    monkeypatch.setitem(app.config, "FILMS_BULK_CHUNK_SIZE", 1)
+
+    with count_queries() as statements:
+        resp = client.post("/films/bulk", json=films_data + ["film"])
+
+    assert resp.status_code == 200
+    assert resp.json["created"] == 2
+    assert resp.json["failed"] == 4
+
+    result = resp.json["result"]
+
+    assert [item_result["index"] for item_result in result] == list(range(6))
+    assert result[1]["message"].startswith("rating")
+    assert result[2]["message"] == "director with such id not found: 100000"
+    assert result[3]["message"] == "genres with such ids not found: 100000, 100001"
+    assert "message" in result[5]
+
+    assert len([statement for statement in statements if "FROM directors" in statement]) == 1
+    assert len([statement for statement in statements if "FROM genres" in statement]) == 1
+
+    for index in (0, 4):
+        film = client.get("/films/{}".format(result[index]["id"])).json
+
+        assert film["title"] == films_data[index]["title"]
+        assert film["director"]["id"] == films_data[index]["director_id"]
+        assert {genre["id"] for genre in film["genres"]} == set(films_data[index]["genres_ids"])
+
+
+def test_add_films_bulk_ndjson(logged_client):
+    client = logged_client
+
+    films_data = [generate_film_data(client) for _ in range(3)]
+    body = "\n".join(json.dumps(film_data) for film_data in films_data) + "\n"
+
+    resp = client.post("/films/bulk", data=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert resp.status_code == 200
+    assert resp.json["created"] == 3
+    assert [client.get("/films/{}".format(item_result["id"])).json["title"] for item_result in resp.json["result"]] \
+        == [film_data["title"] for film_data in films_data]
+
+
+@pytest.mark.parametrize("body, content_type", [
+    ('{"title": "Film title"}', "application/json"),
+    ("not json", "application/json"),
+    ("{}\nnot json", "application/x-ndjson")
+])
+def test_add_films_bulk_bad_body(logged_client, body, content_type):
+    assert logged_client.post("/films/bulk", data=body, headers={"Content-Type": content_type}).status_code == 400
+
+
+def test_add_films_bulk_not_logged(not_logged_client):
+    assert not_logged_client.post("/films/bulk", json=[]).status_code == 401
+
+
 def test_add_film_not_logged(not_logged_client):
     client = not_logged_client
 
@@ -305,6 +532,84 @@ def test_update_film(logged_client):
         assert set(updated_film_data["genres_ids"]) == set([genre.id for genre in updated_film.genres])
 
 
+def test_get_films_after_update(logged_client):
+    client = logged_client
+
+    film_data = generate_film_data(client)
+    added_film_id = client.post("/films/", json=film_data).json["result"]["id"]
+
+    params = urlencode({"director_id": film_data["director_id"], "page": 1, "sort_order": -1})
+    films = client.get("/films/?{}".format(params)).json
+
+    assert films["result"][0]["title"] == film_data["title"]
+
+    updated_film_data = generate_film_data(client) | {"director_id": film_data["director_id"]}
+    client.put("/films/{}".format(added_film_id), json=updated_film_data)
+
+    films = client.get("/films/?{}".format(params)).json
+
+    assert films["result"][0]["id"] == added_film_id
+    assert films["result"][0]["title"] == updated_film_data["title"]
+
+
+def test_get_one_film_not_modified(logged_client, count_queries):
+    client = logged_client
+
+    film_data = generate_film_data(client)
+    added_film_id = client.post("/films/", json=film_data).json["result"]["id"]
+
+    etag = client.get("/films/{}".format(added_film_id)).headers["ETag"]
+
+    with count_queries() as statements:
+        not_modified_resp = client.get("/films/{}".format(added_film_id), headers={"If-None-Match": etag})
+
+    assert not_modified_resp.status_code == 304
+    assert not [statement for statement in statements if "FROM films" in statement]
+
+    client.put("/films/{}".format(added_film_id), json=generate_film_data(client))
+
+    assert client.get("/films/{}".format(added_film_id), headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_update_and_delete_film_read_it_once(logged_client, count_queries):
+    client = logged_client
+
+    added_film_id = client.post("/films/", json=generate_film_data(client)).json["result"]["id"]
+    updated_film_data = generate_film_data(client)
+
+    with count_queries() as statements:
+        assert client.put("/films/{}".format(added_film_id), json=updated_film_data).status_code == 200
+
+    statements = statements[:[statement.startswith("UPDATE films") for statement in statements].index(True)]
+    films_statements = [statement for statement in statements if "FROM films" in statement]
+
+    assert len(films_statements) == 2
+    assert films_statements[0].startswith("SELECT films.user_id \nFROM films")
+
+    with count_queries() as statements:
+        assert client.delete("/films/{}".format(added_film_id)).status_code == 200
+
+    films_statements = [statement for statement in statements
+                        if statement.startswith("SELECT") and "FROM films" in statement]
+
+    assert len(films_statements) == 2
+    assert films_statements[0].startswith("SELECT films.user_id \nFROM films")
+
+
+def test_update_film_by_admin_role_not_queried(logged_admin, count_queries):
+    client = logged_admin
+
+    film = Film.query.filter(Film.user_id != 1).first()
+    film_data = generate_film_data(client)
+
+    for _ in range(2):
+        with count_queries() as statements:
+            assert client.put("/films/{}".format(film.id), json=film_data).status_code == 200
+
+        # user is loaded with joined role or taken from users identities cache
+        assert not [statement for statement in statements if "FROM roles" in statement]
+
+
 def test_update_film_by_admin(logged_client):
     client = logged_client
     film_data = generate_film_data(client)
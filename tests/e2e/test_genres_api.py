@@ -5,7 +5,48 @@ def test_get_genres(client):
     resp = client.get("/films/")
 
     assert resp.status_code == 200
-    assert set(resp.json.keys()) == {"count", "result"}
+    assert set(resp.json.keys()) == {"count", "result", "next_cursor"}
+
+
+def test_get_genres_not_modified(logged_admin):
+    client = logged_admin
+
+    client.post("/genres/", json={"name": "Genre for etag test"})
+
+    resp = client.get("/genres/")
+    etag = resp.headers["ETag"]
+
+    assert resp.status_code == 200
+    assert resp.headers["Last-Modified"]
+
+    not_modified_resp = client.get("/genres/", headers={"If-None-Match": etag})
+
+    assert not_modified_resp.status_code == 304
+    assert not_modified_resp.data == b""
+    assert not_modified_resp.headers["ETag"] == etag
+
+    client.post("/genres/", json={"name": "Another genre for etag test"})
+
+    modified_resp = client.get("/genres/", headers={"If-None-Match": etag})
+
+    assert modified_resp.status_code == 200
+    assert modified_resp.headers["ETag"] != etag
+    assert "Another genre for etag test" in [genre["name"] for genre in modified_resp.json["result"]]
+
+
+def test_get_genres_modified_in_same_second(logged_admin):
+    client = logged_admin
+
+    client.post("/genres/", json={"name": "Genre cached in the same second"})
+
+    resp = client.get("/genres/")
+
+    client.post("/genres/", json={"name": "Genre added in the same second"})
+
+    modified_resp = client.get("/genres/", headers={"If-Modified-Since": resp.headers["Last-Modified"]})
+
+    assert modified_resp.status_code == 200
+    assert "Genre added in the same second" in [genre["name"] for genre in modified_resp.json["result"]]
 
 
 def test_add_genre(logged_admin):
@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from app.metrics import endpoint_labels
+
+
+def test_endpoint_labels():
+    assert endpoint_labels("films_single_films_resource") == ("films", "SingleFilmsResource")
+    assert endpoint_labels("metrics") == ("", "metrics")
+    assert endpoint_labels(None) == ("", "unmatched")
+
+
+def test_metrics(client):
+    client.get("/genres/")
+    client.get("/genres/100000")
+
+    response = client.get("/metrics")
+    text = response.data.decode()
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    assert 'http_requests_total{method="GET",namespace="genres",resource="SingleGenresResource",status="404"}' in text
+    assert 'http_request_duration_seconds_count{method="GET",namespace="genres",resource="GenresResource"}' in text
+    assert 'http_response_size_bytes_bucket{le="+Inf",method="GET",namespace="genres",resource="GenresResource"}' \
+           in text
+    assert 'http_requests_in_flight{method="GET",namespace="",resource="metrics"} 1.0' in text
@@ -0,0 +1,13 @@
+def test_pool_stats(client):
+    response = client.get("/monitoring/pool")
+
+    assert response.status_code == 200
+    assert response.json["pool"]
+    assert set(response.json) >= {"size", "overflow", "in_use", "checkouts", "wait_time"}
+
+
+def test_caches_stats(client):
+    response = client.get("/monitoring/caches")
+
+    assert response.status_code == 200
+    assert {"films", "films_facets", "users"} <= set(response.json)
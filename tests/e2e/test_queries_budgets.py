@@ -0,0 +1,127 @@
+import math
+
+import pytest
+
+from tests.e2e.utils import generate_film_data
+
+from app import app
+from app.database.cruds.films import GENRES_IN_CHUNK_SIZE
+from app.resources.films import films_cache
+from app.resources.utils.responses import NDJSON_MIMETYPE
+
+# Maximum sql queries of each endpoint request, films reads are measured with empty responses cache.
+READ_BUDGETS = [
+    ("/films/", 4),
+    ("/films/?fields=id,title", 3),
+    ("/films/?search=film&sort_by=relevance", 4),
+    ("/films/?genres_ids=1,2&sort_by=rating", 4),
+    ("/films/1", 2),
+    ("/films/facets", 2),
+    ("/genres/", 2),
+    ("/genres/1", 2),
+    ("/directors/", 2),
+    ("/directors/1", 2),
+    ("/monitoring/caches", 0),
+    ("/monitoring/pool", 0),
+]
+
+
+@pytest.mark.parametrize("url, max_queries", READ_BUDGETS)
+def test_read_queries_budget(client, query_budget, url, max_queries):
+    films_cache.clear()
+
+    with query_budget(max_queries):
+        resp = client.get(url)
+
+    assert resp.status_code == 200
+
+
+def test_films_ndjson_queries_budget(client, query_budget):
+    films_count = len(client.get("/films/", headers={"Accept": NDJSON_MIMETYPE}).data.splitlines())
+
+    # films rows and genres of each chunk of streamed films
+    with query_budget(1 + math.ceil(films_count / GENRES_IN_CHUNK_SIZE)):
+        resp = client.get("/films/", headers={"Accept": NDJSON_MIMETYPE})
+        lines = resp.data.splitlines()
+
+    assert resp.status_code == 200
+    assert len(lines) == films_count
+
+
+def test_films_genres_filter_queries_do_not_grow_with_genres(client, count_queries):
+    counts = []
+
+    for genres_ids in ("1", "1,2", "1,2,3,4,5"):
+        films_cache.clear()
+
+        with count_queries() as statements:
+            client.get("/films/?genres_ids={}&sort_by=rating".format(genres_ids))
+
+        counts.append(len(statements))
+
+    assert len(set(counts)) == 1
+
+
+def test_film_writes_queries_budget(logged_client, query_budget):
+    film_data, new_film_data = generate_film_data(logged_client), generate_film_data(logged_client)
+
+    with query_budget(11):
+        resp = logged_client.post("/films/", json=film_data)
+
+    assert resp.status_code == 200
+    film_id = resp.json["result"]["id"]
+
+    with query_budget(13):
+        resp = logged_client.put("/films/{}".format(film_id), json=new_film_data)
+
+    assert resp.status_code == 200
+
+    with query_budget(6):
+        resp = logged_client.delete("/films/{}".format(film_id))
+
+    assert resp.status_code == 200
+
+
+def test_films_bulk_queries_budget(logged_client, query_budget):
+    films = [generate_film_data(logged_client) for _ in range(10)]
+
+    # SQLite inserts films one by one to get their ids, other queries do not depend on films count.
+    with query_budget(len(films) + 6):
+        resp = logged_client.post("/films/bulk", json=films)
+
+    assert resp.status_code == 200
+
+
+def test_genres_and_directors_writes_queries_budget(logged_admin, query_budget):
+    with query_budget(7):
+        resp = logged_admin.post("/genres/", json={"name": "Genre for queries budget"})
+
+    assert resp.status_code == 200
+
+    with query_budget(7):
+        resp = logged_admin.post("/directors/", json={"first_name": "Budget", "last_name": "Director"})
+
+    assert resp.status_code == 200
+
+
+def test_queries_headers(client):
+    films_cache.clear()
+
+    resp = client.get("/films/1")
+
+    assert resp.headers["X-DB-Queries"] == "2"
+    assert float(resp.headers["X-DB-Time"]) > 0
+
+    assert client.get("/monitoring/caches").headers["X-DB-Queries"] == "0"
+
+
+def test_slow_queries_log(client, monkeypatch):
+    warnings = []
+    monkeypatch.setitem(app.config, "SLOW_QUERY_THRESHOLD", 1e-9)
+    monkeypatch.setattr(app.logger, "warning", lambda *args: warnings.append(args))
+
+    client.get("/genres/1")
+
+    assert warnings
+    assert all("GET /genres/1 (genres_single_genres_resource)" in message for _, _, message, *_ in warnings)
+    assert any(parameters == ('genres',) for *_, parameters in warnings)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from app import app, db
+from app.asgi import application
+from app.database.utils.async_engine import dispose_async_engines
+from app.resources.films import films_cache
+
+QUERIES = [
+    "/films/",
+    "/films/?page=2&sort_by=rating&sort_order=-1",
+    "/films/?fields=title,genres&genres_ids=1,2",
+    "/films/?search=a&director_id=1",
+    "/films/?rating=11",
+    "/films/1",
+    "/films/100000",
+    "/directors/",
+    "/genres/"
+]
+
+
+@pytest.fixture
+def async_database(tmp_path, monkeypatch):
+    """Copies test database to file, which async engine connects to."""
+    path = tmp_path / "async.db"
+
+    with app.app_context():
+        connection = db.engine.raw_connection()
+
+    target = sqlite3.connect(path)
+    connection.connection.backup(target)
+    target.close()
+    connection.close()
+
+    monkeypatch.setitem(app.config, "SQLALCHEMY_ASYNC_DATABASE_URI", "sqlite+aiosqlite:///{}".format(path))
+
+    yield path
+
+    asyncio.run(dispose_async_engines())
+
+
+def asgi_get(url, headers=()):
+    """Calls ASGI application, returns status and body."""
+    path, _, query_string = url.partition("?")
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    async def call():
+        await application({
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query_string.encode(),
+            "headers": [(name.encode(), value.encode()) for name, value in headers]
+        }, receive, send)
+
+    asyncio.run(call())
+
+    return messages[0]["status"], b"".join(message.get("body", b"") for message in messages[1:])
+
+
+@pytest.mark.parametrize("url", QUERIES)
+def test_asgi_responses_equal_flask_ones(async_database, client, url):
+    films_cache.clear()
+    status, body = asgi_get(url)
+
+    films_cache.clear()
+    response = client.get(url)
+
+    assert status == response.status_code
+    assert json.loads(body) == response.json
+
+
+def test_asgi_films_cursor(async_database, client):
+    first_page = json.loads(asgi_get("/films/?sort_by=premiere_date")[1])
+    status, body = asgi_get("/films/?sort_by=premiere_date&cursor={}".format(first_page["next_cursor"]))
+
+    films_cache.clear()
+
+    assert status == 200
+    assert json.loads(body)["result"] == client.get("/films/?sort_by=premiere_date&page=2").json["result"]
+
+
+def test_asgi_films_cache_sees_writes_of_wsgi_process(async_database):
+    url = "/films/?sort_by=premiere_date&sort_order=-1"
+    asgi_get(url)
+
+    # write committed by WSGI app process, which bumps films change counter
+    with sqlite3.connect(async_database) as connection:
+        film_id = connection.execute(
+            "INSERT INTO films (title, premiere_date, rating, poster_url, user_id) "
+            "VALUES ('Film of WSGI process', '2040-01-01', 5, 'https://example.com/image', 1)"
+        ).lastrowid
+        connection.execute(
+            "INSERT INTO change_counters (table_name, version, updated_at) VALUES ('films', 1, '2040-01-01 00:00:00') "
+            "ON CONFLICT (table_name) DO UPDATE SET version = version + 1"
+        )
+
+    assert json.loads(asgi_get(url)[1])["result"][0]["id"] == film_id
+
+
+def test_asgi_films_ndjson(async_database, client):
+    status, body = asgi_get("/films/?rating=7", headers=[("Accept", "application/x-ndjson")])
+    response = client.get("/films/?rating=7", headers={"Accept": "application/x-ndjson"})
+
+    assert status == 200
+    assert body.splitlines()
+    assert [json.loads(line) for line in body.splitlines()] == [json.loads(line) for line in response.data.splitlines()]
+
+
+def test_asgi_not_found(async_database):
+    assert asgi_get("/auth/login")[0] == 404
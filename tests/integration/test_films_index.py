@@ -0,0 +1,161 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app import app, db
+
+from app.database.cruds import films as films_crud_module
+from app.database.cruds.films import FilmsCRUD
+from app.database.utils.films_index import FilmsIndex
+from app.database.utils.versions import bump_table_versions
+from app.schemas.films import FilmsQuerySchema, FilmWithUserIdBodySchema
+from app.schemas.genres import GenreCreateSchema
+
+FILTERS = [
+    {},
+    {"director_id": 1},
+    {"rating": 7},
+    {"start_premiere_date": "2010-01-01", "end_premiere_date": "2012-01-01"},
+    {"genres_ids": "1,2"},
+    {"genres_ids": "3,1000"},
+    {"genres_ids": "-1"},
+    {"genres_ids": "2,-3"},
+    {"director_id": 2, "genres_ids": "3", "rating": 8}
+]
+
+SORTINGS = [
+    {},
+    {"sort_order": -1},
+    {"sort_by": "rating", "sort_order": 1},
+    {"sort_by": "rating", "sort_order": -1},
+    {"sort_by": "premiere_date", "sort_order": 1},
+    {"sort_by": "premiere_date", "sort_order": -1}
+]
+
+
+@pytest.fixture
+def films_index(monkeypatch):
+    films_index = FilmsIndex()
+    monkeypatch.setattr(films_crud_module, "films_index", films_index)
+
+    return films_index
+
+
+def read_ids(data):
+    return [film.id for film in FilmsCRUD().read(data)]
+
+
+def count_loads(monkeypatch, films_index):
+    loads = []
+    load = films_index.load
+
+    def counted_load(*args, **kwargs):
+        loads.append(args)
+        load(*args, **kwargs)
+
+    monkeypatch.setattr(films_index, "load", counted_load)
+
+    return loads
+
+
+@pytest.mark.parametrize("filters, sorting", list(itertools.product(FILTERS, SORTINGS)))
+def test_films_index_parity(monkeypatch, filters, sorting):
+    pages = [FilmsQuerySchema.parse_obj(filters | sorting | {"page": page}) for page in (1, 2, 50)]
+
+    expected_ids = [read_ids(data) for data in pages]
+
+    films_index = FilmsIndex()
+    monkeypatch.setattr(films_crud_module, "films_index", films_index)
+
+    assert [read_ids(data) for data in pages] == expected_ids
+    assert [films_index.select_ids(db.session, data, app.config["FILMS_PER_PAGE"]) for data in pages] == expected_ids
+
+    crud = FilmsCRUD()
+    films = crud.read_dicts(pages[0])
+    cursor = crud.next_cursor(films, pages[0])
+
+    if cursor:
+        data = FilmsQuerySchema.parse_obj(filters | sorting | {"cursor": cursor})
+        assert read_ids(data) == expected_ids[1]
+
+
+def test_films_index_falls_back_to_database(films_index):
+    assert films_index.select_ids(db.session, FilmsQuerySchema.parse_obj({"search": "a"}), 10) is None
+    assert films_index.select_ids(db.session, FilmsQuerySchema.parse_obj({"page": -1}), 10) is None
+
+
+def test_films_index_incremental_updates(monkeypatch, films_index):
+    crud = FilmsCRUD()
+    data = FilmsQuerySchema.parse_obj({"sort_by": "premiere_date", "sort_order": -1, "page": 1})
+
+    crud.read(data)
+    version = films_index.version
+    loads = count_loads(monkeypatch, films_index)
+
+    film = crud.create(FilmWithUserIdBodySchema.parse_obj({
+        "title": "Indexed film",
+        "premiere_date": "2030-01-01",
+        "rating": 5,
+        "poster_url": "https://example.com/image",
+        "director_id": 1,
+        "genres_ids": [1],
+        "user_id": 1
+    }))
+
+    assert films_index.version == version + 1
+    assert read_ids(data)[0] == film.id
+    assert read_ids(FilmsQuerySchema.parse_obj({"genres_ids": "1", "sort_by": "premiere_date", "sort_order": -1,
+                                                "page": 1}))[0] == film.id
+
+    crud.delete(film.id)
+
+    assert films_index.version == version + 2
+    assert film.id not in read_ids(data)
+    assert not loads
+
+
+def test_films_index_reloads_after_external_write(monkeypatch, films_index, genres_crud, faker):
+    data = FilmsQuerySchema.parse_obj({"page": 1})
+
+    read_ids(data)
+    version = films_index.version
+    loads = count_loads(monkeypatch, films_index)
+
+    # genres writes bump films change counter, as films embed genres
+    genres_crud.create(GenreCreateSchema(name=faker.pystr()))
+    read_ids(data)
+
+    assert len(loads) == 1
+    assert films_index.version == version + 1
+
+
+def test_films_index_writes_after_external_write(monkeypatch, films_index):
+    crud = FilmsCRUD()
+    data = FilmsQuerySchema.parse_obj({"sort_by": "premiere_date", "sort_order": -1, "page": 1})
+
+    crud.read(data)
+    loads = count_loads(monkeypatch, films_index)
+
+    # write of another process
+    bump_table_versions(db.session, ("films",))
+    db.session.commit()
+
+    film_data = FilmWithUserIdBodySchema.parse_obj({
+        "title": "Film written after external write",
+        "premiere_date": "2030-01-01",
+        "rating": 5,
+        "poster_url": "https://example.com/image",
+        "director_id": 1,
+        "genres_ids": [1],
+        "user_id": 1
+    })
+
+    film = crud.create(film_data)
+    crud.delete(film.id)
+    another_film = crud.create(film_data)
+
+    assert films_index.version is None
+    assert read_ids(data)[0] == another_film.id
+    assert len(loads) == 1
@@ -1,14 +1,19 @@
+import re
+import json
 import math
 import random
 from datetime import datetime
 
+import pytest
+
 from app import app
 
 from app.domain.films import get_all_films
 from app.domain.directors import get_all_directors
 from app.domain.genres import get_all_genres
 
-from app.schemas.films import FilmsQuerySchema
+from app.schemas.films import FilmsQuerySchema, FilmWithUserIdBodySchema, FilmBodySchema
+from app.utils.exceptions import GenreIdError, EntityIdError
 
 
 def test_films_query_search(faker, films_crud):
@@ -19,13 +24,47 @@ def test_films_query_search(faker, films_crud):
 
         expected_films = []
         for film in films:
-            if word.lower() in film.title.lower():
+            if any(title_word.startswith(word.lower()) for title_word in re.findall(r"\w+", film.title.lower())):
                 expected_films.append(film)
 
         assert len(expected_films) == len(searched_films)
         assert set([str(film) for film in expected_films]) == set([str(film) for film in searched_films])
 
 
+def test_films_query_search_in_description(faker, films_crud):
+    films = get_all_films(films_crud, FilmsQuerySchema.parse_obj({"page": -1}))
+
+    for word in faker.words(app.config["EACH_TEST_REPEATS"]):
+        searched_films = get_all_films(films_crud, FilmsQuerySchema.parse_obj({
+            "search": word,
+            "search_in_description": True,
+            "page": -1
+        }))
+
+        expected_films = []
+        for film in films:
+            film_words = re.findall(r"\w+", "{} {}".format(film.title, film.description or "").lower())
+            if any(film_word.startswith(word.lower()) for film_word in film_words):
+                expected_films.append(film)
+
+        assert set([film.id for film in expected_films]) == set([film.id for film in searched_films])
+
+
+def test_films_query_search_relevance(films_crud):
+    films = get_all_films(films_crud, FilmsQuerySchema.parse_obj({"page": -1}))
+    word = re.findall(r"\w+", films[0].title.lower())[0]
+
+    searched_films = get_all_films(films_crud, FilmsQuerySchema.parse_obj({
+        "search": word,
+        "search_in_description": True,
+        "sort_by": "relevance",
+        "page": -1
+    }))
+
+    assert films[0].id in [film.id for film in searched_films]
+    assert any(title_word.startswith(word) for title_word in re.findall(r"\w+", searched_films[0].title.lower()))
+
+
 def test_films_query_director_filter(films_crud, directors_crud):
     films = get_all_films(films_crud, FilmsQuerySchema.parse_obj({"page": -1}))
     directors = get_all_directors(directors_crud)
@@ -170,3 +209,134 @@ def test_films_query_page(films_crud):
 
     assert len(get_all_films(films_crud, FilmsQuerySchema.parse_obj({"page": last_page}))) == last_page_count
     assert len(get_all_films(films_crud, FilmsQuerySchema.parse_obj({"page": last_page + 1}))) == 0
+
+
+@pytest.mark.parametrize("query", [
+    {"page": 1},
+    {"page": 2},
+    {"page": -1},
+    {"page": -1, "sort_by": "rating", "sort_order": -1},
+    {"page": -1, "genres_ids": "1,2,3"}
+])
+def test_films_query_relationships_loading(films_crud, count_queries, query):
+    with count_queries() as statements:
+        films = get_all_films(films_crud, FilmsQuerySchema.parse_obj(query))
+
+        for film in films:
+            film.dict()
+
+    genres_queries = math.ceil(len(films) / 500) or 1
+
+    # films (with director and user joined), pagination count and genres selectin
+    assert len(statements) <= 2 + genres_queries
+
+
+@pytest.mark.parametrize("fields, expected_keys", [
+    ("title", {"id", "title"}),
+    ("title,rating", {"id", "title", "rating"}),
+    ("director,premiere_date", {"id", "director", "premiere_date"})
+])
+def test_films_query_fields(films_crud, count_queries, fields, expected_keys):
+    with count_queries() as statements:
+        films = get_all_films(films_crud, FilmsQuerySchema.parse_obj({"page": -1, "fields": fields}))
+
+    assert films and all(film.dict().keys() == expected_keys for film in films)
+
+    # single films query without description, users and genres
+    assert len(statements) == 1
+    assert "description" not in statements[0]
+    assert "users" not in statements[0] and "genres" not in statements[0]
+
+
+@pytest.mark.parametrize("query", [
+    {"page": -1},
+    {"page": 3, "sort_by": "rating", "sort_order": -1},
+    {"page": -1, "genres_ids": "1,2", "sort_by": "premiere_date"},
+    {"page": 1, "search": "a", "sort_by": "relevance"},
+    {"page": -1, "fields": "title,genres"},
+    {"page": -1, "fields": "director,user", "sort_by": "rating"}
+])
+def test_films_read_dicts_parity(films_crud, query):
+    data = FilmsQuerySchema.parse_obj(query)
+
+    films = [film.dict() for film in films_crud.read(data)]
+
+    assert json.dumps(films_crud.read_dicts(data), ensure_ascii=False) == json.dumps(films, ensure_ascii=False)
+
+    if data.page == -1:
+        assert list(films_crud.read_dicts_iter(data)) == films
+
+
+def test_films_read_dicts_parity_without_director(films_crud):
+    film = films_crud.create(FilmWithUserIdBodySchema.parse_obj({
+        "title": "Film without director",
+        "premiere_date": "2022-01-01",
+        "rating": 5,
+        "poster_url": "https://example.com/image",
+        "genres_ids": [2, 1],
+        "user_id": 1
+    }))
+
+    data = FilmsQuerySchema.parse_obj({"page": -1, "search": film.title})
+
+    films_dicts = [film_dict for film_dict in films_crud.read_dicts(data) if film_dict["id"] == film.id]
+
+    assert films_dicts[0]["director"] == "unknown"
+    assert films_dicts == [found_film.dict() for found_film in films_crud.read(data) if found_film.id == film.id]
+
+
+def test_films_update_genres_diff(films_crud, count_queries):
+    film_data = {
+        "title": "Film with changing genres",
+        "premiere_date": "2022-01-01",
+        "rating": 5,
+        "poster_url": "https://example.com/image",
+        "director_id": 1
+    }
+
+    film = films_crud.create(FilmWithUserIdBodySchema.parse_obj(film_data | {"genres_ids": [1, 2, 3], "user_id": 1}))
+
+    with count_queries() as statements:
+        updated_film = films_crud.update(film.id, FilmBodySchema.parse_obj(film_data | {"genres_ids": [2, 3, 4]}))
+
+    assert [genre.id for genre in updated_film.genres] == [2, 3, 4]
+
+    genres_statements = [statement for statement in statements if "genres" in statement and " IN " in statement]
+    film_genres_writes = [statement for statement in statements
+                          if statement.startswith(("INSERT INTO film_genres", "DELETE FROM film_genres"))]
+
+    assert len(genres_statements) == 1
+    # genre 1 removed and genre 4 added, rows of genres 2 and 3 are untouched
+    assert [statement.split()[0] for statement in film_genres_writes] == ["DELETE", "INSERT"]
+
+
+def test_films_create_reports_all_missing_genres(films_crud):
+    with pytest.raises(GenreIdError, match="100000, 100001"):
+        films_crud.create(FilmWithUserIdBodySchema.parse_obj({
+            "title": "Film with missing genres",
+            "premiere_date": "2022-01-01",
+            "rating": 5,
+            "poster_url": "https://example.com/image",
+            "genres_ids": [1, 100001, 100000],
+            "user_id": 1
+        }))
+
+
+def test_films_bulk_create_reports_film_without_premiere_date(films_crud, monkeypatch):
+    monkeypatch.setitem(app.config, "FILMS_BULK_CHUNK_SIZE", 1)
+
+    film_data = {
+        "title": "Bulk film",
+        "premiere_date": "2022-01-01",
+        "rating": 5,
+        "poster_url": "https://example.com/image",
+        "user_id": 1
+    }
+
+    results = films_crud.bulk_create([
+        FilmWithUserIdBodySchema.construct(**(film_data | {"premiere_date": None})),
+        FilmWithUserIdBodySchema.parse_obj(film_data)
+    ])
+
+    assert isinstance(results[0], EntityIdError)
+    assert isinstance(results[1], int)
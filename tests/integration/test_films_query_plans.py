@@ -0,0 +1,75 @@
+import re
+import itertools
+
+import pytest
+
+from app import db
+
+from app.schemas.films import FilmsQuerySchema
+
+FILTERS = [
+    {"director_id": 1},
+    {"rating": 7},
+    {"start_premiere_date": "2010-01-01"},
+    {"end_premiere_date": "2010-01-01"},
+    {"start_premiere_date": "2010-01-01", "end_premiere_date": "2012-01-01"},
+    {"genres_ids": "1,2"},
+    {"search": "word"},
+    {"director_id": 1, "rating": 7},
+    {"director_id": 1, "genres_ids": "3"},
+    {"rating": 7, "start_premiere_date": "2010-01-01"}
+]
+
+SORTINGS = [
+    {},
+    {"sort_by": "rating", "sort_order": 1},
+    {"sort_by": "rating", "sort_order": -1},
+    {"sort_by": "premiere_date", "sort_order": 1},
+    {"sort_by": "premiere_date", "sort_order": -1}
+]
+
+# Open-ended premiere date ranges match most films, so with id sort SQLite walks films in id order until LIMIT is
+# filled, which is cheaper than sorting the index range. No index serves a range of one column ordered by another.
+SQLITE_ID_ORDER_SCANS = [
+    {"start_premiere_date": "2010-01-01"},
+    {"end_premiere_date": "2010-01-01"}
+]
+
+SEQ_SCANS = {
+    # SQLite reports index scans as "SCAN table USING (COVERING) INDEX" and walks of the rowid b-tree as "SCAN table".
+    "sqlite": re.compile(r"\bSCAN (films|film_genres)\b(?! USING (COVERING )?INDEX)"),
+    "postgresql": re.compile(r"Seq Scan on (films|film_genres)\b")
+}
+
+
+def explain(query):
+    dialect = db.engine.dialect
+    compiled = query.statement.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    explain_prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+
+    with db.engine.begin() as connection:
+        if dialect.name == "postgresql":
+            # small test tables are cheaper to seq scan, plans show whether an index can serve the query at all
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+        rows = connection.exec_driver_sql(explain_prefix + str(compiled), params).fetchall()
+
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+@pytest.mark.parametrize("filters, sorting", list(itertools.product(FILTERS, SORTINGS)))
+def test_films_query_plan_has_no_seq_scan(films_crud, filters, sorting):
+    query = films_crud._films_query(FilmsQuerySchema.parse_obj(filters | sorting)).limit(10)
+    plan = explain(query)
+
+    if db.engine.dialect.name == "sqlite" and filters in SQLITE_ID_ORDER_SCANS and not sorting:
+        assert "USE TEMP B-TREE" not in plan, plan
+        return
+
+    assert not SEQ_SCANS[db.engine.dialect.name].search(plan), plan
@@ -0,0 +1,72 @@
+import pytest
+from flask_sqlalchemy import get_state
+from sqlalchemy import create_engine
+
+from app import app, db
+from app.database.models import Genre
+from app.database.utils.routing import replicas_binds
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    uris = ["sqlite:///{}".format(tmp_path / "replica_{}.db".format(number)) for number in range(2)]
+
+    for number, uri in enumerate(uris):
+        engine = create_engine(uri)
+        db.Model.metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            connection.execute(Genre.__table__.insert(), {"id": 1, "name": "replica {}".format(number)})
+
+        engine.dispose()
+
+    binds = app.config["SQLALCHEMY_BINDS"]
+    app.config["SQLALCHEMY_BINDS"] = replicas_binds(",".join(uris))
+    db.session.remove()
+
+    yield
+
+    db.session.remove()
+
+    for bind in replicas_binds(",".join(uris)):
+        db.get_engine(app, bind).dispose()
+        get_state(app).connectors.pop(bind)
+
+    app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def genre_name(client):
+    return client.get("/genres/1").json["name"]
+
+
+def primary_genre_name():
+    with app.app_context():
+        return db.session.get(Genre, 1).name
+
+
+def test_replicas_binds():
+    assert replicas_binds(None) == {}
+    assert replicas_binds("sqlite:///a.db, sqlite:///b.db") == {
+        "replica_0": "sqlite:///a.db",
+        "replica_1": "sqlite:///b.db"
+    }
+
+
+def test_get_requests_read_from_replicas_round_robin(replicas, client):
+    assert {genre_name(client), genre_name(client)} == {"replica 0", "replica 1"}
+
+
+def test_reads_after_write_stick_to_primary(replicas, logged_admin, faker):
+    response = logged_admin.post("/genres/", json={"name": faker.pystr()})
+
+    assert response.status_code == 200
+    assert genre_name(logged_admin) == primary_genre_name()
+    assert genre_name(app.test_client()).startswith("replica")
+
+
+def test_primary_sticky_window_expires(replicas, logged_admin, faker, monkeypatch):
+    monkeypatch.setitem(app.config, "DB_PRIMARY_STICKY_SECONDS", 0)
+
+    logged_admin.post("/genres/", json={"name": faker.pystr()})
+
+    assert genre_name(logged_admin).startswith("replica")
@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+
+import pytest
+from sqlalchemy import event
+from werkzeug.serving import make_server
+
+from app import app, db
+from app.database.utils.routing import RoutingSession
+
+URLS = ["/films/?page={}".format(page) for page in range(1, 6)] + ["/films/1", "/genres/", "/directors/"]
+
+
+@pytest.fixture
+def server_url():
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield "http://127.0.0.1:{}".format(server.server_port)
+
+    server.shutdown()
+    thread.join()
+
+
+def test_concurrent_requests_do_not_share_sessions(server_url, client):
+    expected = {url: client.get(url).data for url in URLS}
+
+    lock = threading.Lock()
+    sessions_threads = {}
+
+    def after_begin(session, transaction, connection):
+        with lock:
+            sessions_threads.setdefault(session, set()).add(threading.get_ident())
+
+    def get(url):
+        with urlopen(server_url + url) as response:
+            return url, response.read()
+
+    db.session.remove()
+    event.listen(RoutingSession, "after_begin", after_begin)
+
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(get, URLS * 25))
+    finally:
+        event.remove(RoutingSession, "after_begin", after_begin)
+
+    assert all(body == expected[url] for url, body in responses)
+    assert all(len(threads) == 1 for threads in sessions_threads.values())
+    assert not db.session.registry.registry
@@ -0,0 +1,73 @@
+import time
+
+from app.utils.cache import LRUCache, Generation, caches
+from app.schemas.films import FilmsQuerySchema
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_ttl():
+    cache = LRUCache(2, ttl=0.01)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_cache_generation():
+    generation = Generation()
+    cache = LRUCache(2, generation=generation)
+
+    cache.set("a", 1)
+    generation.bump()
+
+    assert cache.get("a") is None
+
+
+def test_cache_disabled():
+    cache = LRUCache(0)
+
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_films_query_cache_key():
+    assert FilmsQuerySchema.parse_obj({"genres_ids": "3,1,3", "rating": 5}).cache_key() == \
+           FilmsQuerySchema.parse_obj({"rating": "5", "genres_ids": "1,3", "page": 1, "sort_order": 1}).cache_key()
+
+    assert FilmsQuerySchema.parse_obj({"genres_ids": "1,2"}).cache_key() != \
+           FilmsQuerySchema.parse_obj({"genres_ids": "1,3"}).cache_key()
+
+
+def test_cache_stats():
+    cache = LRUCache(2, name="test")
+
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+
+    assert caches["test"] is cache
+    assert cache.stats() == {"size": 1, "maxsize": 2, "hits": 1, "misses": 1}
+
+
+def test_cache_explicit_generation():
+    cache = LRUCache(2)
+
+    # value computed while data changed from generation 1 to 2
+    cache.set("a", 1, generation=1)
+
+    assert cache.get("a", generation=1) == 1
+    assert cache.get("a", generation=2) is None
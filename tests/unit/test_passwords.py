@@ -0,0 +1,34 @@
+import pytest
+
+from app import app
+from app.utils import passwords
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_hash_password(monkeypatch, workers):
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_WORKERS", workers)
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+
+    password_hash = passwords.hash_password("password")
+
+    assert password_hash.startswith("pbkdf2:sha256:1000$")
+    assert passwords.check_password(password_hash, "password")
+    assert not passwords.check_password(password_hash, "another")
+
+
+@pytest.mark.parametrize("method, salt_length, needs_rehash", [
+    ("pbkdf2:sha256", 16, False),
+    ("pbkdf2", 16, True),
+    ("pbkdf2:sha256:260000", 16, False),
+    ("pbkdf2:sha256:600000", 16, True),
+    ("pbkdf2:sha512", 16, True),
+    ("pbkdf2:sha256", 20, True)
+])
+def test_password_needs_rehash(monkeypatch, method, salt_length, needs_rehash):
+    password_hash = "pbkdf2:sha256:260000$V8uebrIuFzgJN4Xj$" \
+                    "1eb120a7d085bf0b99bc3fe471a550e8704f0d8c7212fc5634bc3204a3b6f056"
+
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_METHOD", method)
+    monkeypatch.setitem(app.config, "PASSWORD_SALT_LENGTH", salt_length)
+
+    assert passwords.password_needs_rehash(password_hash) is needs_rehash
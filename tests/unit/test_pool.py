@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app import app, db
+from app.config import engine_options_from_env
+from app.database.utils.pool import InstrumentedQueuePool, pool_stats
+
+
+def test_engine_options_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "1")
+    monkeypatch.delenv("DB_MAX_OVERFLOW", raising=False)
+
+    options = engine_options_from_env()
+
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"] is True
+    assert "max_overflow" not in options
+
+
+def test_in_memory_sqlite_keeps_static_pool():
+    with app.app_context():
+        assert pool_stats(db.engine.pool)["pool"] == "StaticPool"
+
+
+def test_instrumented_pool_stats(tmp_path):
+    engine = create_engine("sqlite:///{}".format(tmp_path / "pool.db"), poolclass=InstrumentedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+    connection = engine.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    stats = pool_stats(engine.pool)
+
+    assert stats["pool"] == "InstrumentedQueuePool"
+    assert stats["in_use"] == 1
+    assert stats["connections"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["max_wait_time"] >= 0.05
+
+    connection.close()
+    engine.dispose()
+
+    with engine.connect():
+        stats = pool_stats(engine.pool)
+
+    assert stats["checkouts"] == 2
+    assert stats["connections"] == 2
+    assert stats["max_in_use"] == 1
@@ -0,0 +1,37 @@
+import json
+import datetime
+
+import pytest
+
+from app import app
+from app.resources.utils import representations
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(representations, "orjson", None)
+    elif representations.orjson is None:
+        pytest.skip("orjson is not installed.")
+
+    return request.param
+
+
+def test_dumps(encoder):
+    data = {"title": "Фильм", "premiere_date": datetime.date(2022, 2, 2), "genres": [{"name": "Drama", "id": 1}]}
+
+    with app.app_context():
+        dumped = representations.dumps(data)
+
+    assert "Фильм".encode() in dumped
+    assert json.loads(dumped) == data | {"premiere_date": "2022-02-02"}
+
+
+def test_output_json(encoder):
+    with app.app_context():
+        response = representations.output_json({"message": "ok"}, 201, {"X-Test": "1"})
+
+    assert response.status_code == 201
+    assert response.headers["X-Test"] == "1"
+    assert response.data.endswith(b"\n")
+    assert json.loads(response.data) == {"message": "ok"}